@@ -1,15 +1,490 @@
+import argparse
+import bisect
 import csv
+import hashlib
+import heapq
+import io
+import json
+import math
 import os
+import re
+from array import array
 
 # Name of the CSV file used to store contact data
 FILENAME = "contacts.csv"
+# Lookup index persisted next to the contacts file
+INDEX_FILE = "contacts.idx.json"
+# Trigram postings for substring/fuzzy search, also next to the contacts file
+GRAMS_FILE = "contacts.grams.bin"
+# Byte offset of every row, used to jump straight to a page
+OFFSETS_FILE = "contacts.offsets.bin"
+# Column headers of the contacts file
+HEADER = ["Name", "Mobile No.", "Email ID"]
+# Number of contacts shown per page by the viewer
+PAGE_SIZE = 20
+# Write buffer used by batch imports (1 MiB)
+WRITE_BUFFER = 1 << 20
+# Matches everything that is not a digit in a mobile number
+NON_DIGITS = re.compile(r"\D")
+# Search terms made only of these characters are treated as phone numbers
+PHONE_LIKE = re.compile(r"[\d\s+\-()]+")
+# Number of bytes at the end of the indexed region hashed to detect outside edits
+FINGERPRINT_BYTES = 4096
 
 # If the contacts file doesn't exist, create it and write the header row
 if not os.path.exists(FILENAME):
     with open(FILENAME, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         # Write column headers: Name, Mobile No., Email ID
-        writer.writerow(["Name", "Mobile No.", "Email ID"])
+        writer.writerow(HEADER)
+
+
+def normalize_mobile(mobile):
+    """Keep only the digits of a mobile number so formatting doesn't matter."""
+    return NON_DIGITS.sub("", mobile)
+
+
+def file_fingerprint(filename, size):
+    """
+    Fingerprint the first 'size' bytes of a file for fingerprint_matches():
+    a hash of the last FINGERPRINT_BYTES bytes before 'size' and the file's
+    modification time. (Kept identical in 00_contact_vault.py,
+    03_temp_trail.py and 04_graph_craft.py.)
+    """
+    with open(filename, "rb") as f:
+        start = max(0, size - FINGERPRINT_BYTES)
+        f.seek(start)
+        digest = hashlib.sha1(f.read(size - start)).hexdigest()
+        return [digest, os.fstat(f.fileno()).st_mtime_ns]
+
+
+def fingerprint_matches(filename, size, fingerprint):
+    """
+    Return True if the first 'size' bytes of a file are unchanged since
+    'fingerprint' was taken, so only the bytes after them need reading. A
+    file that grew only has the hashed tail compared (appending updates the
+    modification time); one of the same size must also keep its modification
+    time, which catches same-length edits away from the tail.
+    """
+    if not isinstance(fingerprint, list) or len(fingerprint) != 2:
+        return False  # missing, or saved by an older version
+    current_size = os.path.getsize(filename)
+    if size > current_size:
+        return False
+    with open(filename, "rb") as f:
+        if size == current_size and os.fstat(f.fileno()).st_mtime_ns != fingerprint[1]:
+            return False
+        start = max(0, size - FINGERPRINT_BYTES)
+        f.seek(start)
+        return hashlib.sha1(f.read(size - start)).hexdigest() == fingerprint[0]
+
+
+def trigrams(text):
+    """Return the set of 3-character substrings of an already folded string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def fold_query(term):
+    """
+    Fold a search term the same way contact fields are folded for the
+    trigram index: phone-like terms keep only digits, anything else is
+    case-folded.
+    """
+    if PHONE_LIKE.fullmatch(term):
+        return normalize_mobile(term)
+    return term.casefold()
+
+
+class ContactIndex:
+    """
+    In-memory lookup tables for the contacts file, persisted to INDEX_FILE.
+
+    Every row gets an integer id (its position in 'rows'). Names are
+    case-folded so duplicate checks and exact lookups are plain dictionary
+    hits, and a sorted list of the folded names answers prefix searches with
+    bisect instead of scanning every row. The index remembers how many bytes
+    of the CSV it covers, so rows appended later are folded in by reading only
+    the new tail of the file.
+
+    A trigram inverted index over name, mobile and email backs substring and
+    fuzzy search. It is built on the first search that needs it, kept up to
+    date as rows are added, and saved to GRAMS_FILE.
+    """
+
+    def __init__(self):
+        self.rows = []     # row id -> [name, mobile, email]
+        self.names = {}    # folded name -> list of row ids
+        self.mobiles = {}  # digits-only mobile -> row id
+        self.emails = {}   # folded email -> row id
+        self.sorted_names = []
+        self.size = 0      # bytes of the CSV file covered by the index
+        # Changes on every full rebuild so a stale trigram file is never reused
+        self.generation = os.urandom(8).hex()
+        self.grams = None  # trigram -> array of row ids, built on demand
+        self.texts = None  # row id -> row_text(), built along with the trigrams
+        self.dirty = False
+        self.grams_dirty = False
+
+    @staticmethod
+    def row_text(row):
+        """
+        Join a row's folded name, mobile digits and email into one string.
+        The NUL separators keep trigrams and substrings from spanning fields.
+        """
+        name, mobile, email = row
+        return f"{name.casefold()}\0{normalize_mobile(mobile)}\0{email.casefold()}"
+
+    def add_row(self, row, keep_sorted=True):
+        """
+        Add one [name, mobile, email] row to every lookup table.
+        Bulk loaders pass keep_sorted=False and re-sort the names once at the end.
+        """
+        row = (list(row) + ["", "", ""])[:3]
+        row_id = len(self.rows)
+        self.rows.append(row)
+
+        key = row[0].casefold()
+        if key not in self.names:
+            self.names[key] = []
+            if keep_sorted:
+                bisect.insort(self.sorted_names, key)
+        self.names[key].append(row_id)
+
+        # Mobile and email lookups point straight at the row
+        digits = normalize_mobile(row[1])
+        if digits:
+            self.mobiles.setdefault(digits, row_id)
+        if row[2]:
+            self.emails.setdefault(row[2].casefold(), row_id)
+
+        # Only maintain trigrams and row texts once they have been built
+        if self.grams is not None:
+            text = self.row_text(row)
+            self.texts.append(text)
+            self._add_grams(row_id, text)
+            self.grams_dirty = True
+        self.dirty = True
+
+    def _add_grams(self, row_id, text):
+        """Append a row id to the posting list of each trigram of its row text."""
+        for gram in trigrams(text):
+            if "\0" in gram:
+                continue
+            postings = self.grams.get(gram)
+            if postings is None:
+                postings = self.grams[gram] = array("I")
+            postings.append(row_id)
+
+    def contains(self, name):
+        """Return True if a contact with this name (any case) exists."""
+        return name.casefold() in self.names
+
+    def lookup(self, name):
+        """Return all rows whose name matches exactly, ignoring case."""
+        return [self.rows[i] for i in self.names.get(name.casefold(), [])]
+
+    def lookup_mobile(self, mobile):
+        """Return the row owning this mobile number, as a list."""
+        row_id = self.mobiles.get(normalize_mobile(mobile))
+        return [self.rows[row_id]] if row_id is not None else []
+
+    def lookup_email(self, email):
+        """Return the row owning this email address, as a list."""
+        row_id = self.emails.get(email.casefold())
+        return [self.rows[row_id]] if row_id is not None else []
+
+    def prefix(self, prefix, limit=None):
+        """
+        Return rows whose name starts with 'prefix' (case-insensitive).
+        Uses bisect on the sorted names, so only the matching range is visited.
+        """
+        prefix = prefix.casefold()
+        results = []
+        pos = bisect.bisect_left(self.sorted_names, prefix)
+        while pos < len(self.sorted_names) and self.sorted_names[pos].startswith(prefix):
+            results.extend(self.rows[i] for i in self.names[self.sorted_names[pos]])
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+            pos += 1
+        return results
+
+    def search(self, term, limit=20, threshold=0.4):
+        """
+        Ranked substring and typo-tolerant search over name, mobile and email.
+
+        A row is a candidate if it shares at least 'threshold' of the query's
+        trigrams. Because of that bound it must appear in one of the rarest
+        posting lists, so only those lists are read. Candidates are ranked:
+        names starting with the term first, then any substring match, then
+        fuzzy matches by the share of trigrams they have in common.
+        Terms shorter than three characters fall back to a prefix search.
+        """
+        query = fold_query(term)
+        query_grams = trigrams(query)
+        if not query_grams:
+            return self.prefix(term, limit)
+
+        self.ensure_grams()
+        empty = array("I")
+        postings = sorted((self.grams.get(gram, empty) for gram in query_grams), key=len)
+
+        # Rows holding every query trigram, intersected rarest list first.
+        # If enough of them really contain the term, fuzzy matches could never
+        # make the top 'limit', so the wider fuzzy pass is skipped.
+        common = set(postings[0])
+        for ids in postings[1:]:
+            if not common:
+                break
+            common.intersection_update(ids)
+        texts = self.texts
+        candidates = {row_id for row_id in common if query in texts[row_id]}
+
+        if len(candidates) < limit:
+            need = max(1, math.ceil(threshold * len(query_grams)))
+            for ids in postings[:len(query_grams) - need + 1]:
+                candidates.update(ids)
+
+        ranked = []
+        for row_id in candidates:
+            row = self.rows[row_id]
+            text = texts[row_id]
+            if text.startswith(query):
+                tier, score = 0, 1.0
+            elif query in text:
+                tier, score = 1, 1.0
+            else:
+                tier = 2
+                score = sum(gram in text for gram in query_grams) / len(query_grams)
+                if score < threshold:
+                    continue
+            ranked.append((tier, -score, len(row[0]), row_id))
+
+        return [self.rows[item[3]] for item in heapq.nsmallest(limit, ranked)]
+
+    def ensure_grams(self, grams_file=GRAMS_FILE):
+        """
+        Make the trigram index available, loading GRAMS_FILE when it belongs
+        to this index and building the missing part from the rows otherwise.
+        The folded text of every row is computed here once and reused by
+        every search.
+        """
+        if self.grams is not None:
+            return
+        self.texts = [self.row_text(row) for row in self.rows]
+        self.grams = {}
+        covered = 0
+        try:
+            with open(grams_file, "rb") as f:
+                header = json.loads(f.readline())
+                if header["generation"] == self.generation and header["count"] <= len(self.rows):
+                    blob = array("I")
+                    blob.frombytes(f.read())
+                    self.grams = {gram: blob[start:start + count]
+                                  for gram, (start, count) in header["grams"].items()}
+                    covered = header["count"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        # Index rows that the saved file doesn't cover yet
+        for row_id in range(covered, len(self.rows)):
+            self._add_grams(row_id, self.texts[row_id])
+        self.grams_dirty = covered < len(self.rows)
+
+    def index_file(self, filename, start=0):
+        """
+        Parse the contacts file from byte offset 'start' and index every row.
+        When starting from the beginning, the header row is skipped.
+        """
+        with open(filename, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        if start == 0:
+            next(reader, None)
+        for row in reader:
+            if row:
+                self.add_row(row, keep_sorted=False)
+        self.sorted_names = sorted(self.names)
+        self.size = start + len(data)
+        self.dirty = True
+
+    def save(self, filename=FILENAME, index_file=INDEX_FILE, grams_file=GRAMS_FILE):
+        """
+        Write the index (and the trigram index, if built) to disk when they
+        changed since they were loaded. Files are written to a temporary path
+        and renamed so a crash can't leave a half-written index behind.
+        """
+        if self.dirty:
+            state = {
+                "size": self.size,
+                "fingerprint": file_fingerprint(filename, self.size),
+                "generation": self.generation,
+                "rows": self.rows,
+                "names": self.names,
+                "mobiles": self.mobiles,
+                "emails": self.emails,
+            }
+            tmp_file = index_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                # json.dumps runs entirely in the C encoder, unlike json.dump
+                f.write(json.dumps(state))
+            os.replace(tmp_file, index_file)
+            self.dirty = False
+
+        if self.grams is not None and self.grams_dirty:
+            # One JSON header line mapping each trigram to a slice of the
+            # packed row-id array that follows it
+            directory = {}
+            blob = array("I")
+            for gram, ids in self.grams.items():
+                directory[gram] = [len(blob), len(ids)]
+                blob.extend(ids)
+            header = {"generation": self.generation, "count": len(self.rows), "grams": directory}
+            tmp_file = grams_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                blob.tofile(f)
+            os.replace(tmp_file, grams_file)
+            self.grams_dirty = False
+
+    @classmethod
+    def load(cls, filename=FILENAME, index_file=INDEX_FILE):
+        """
+        Load the saved index, or rebuild it from the contacts file.
+
+        The saved index is trusted only if the bytes it covers still match the
+        stored fingerprint (tail hash, and modification time unless the file
+        grew). If the file has grown since, only the new rows are read. Any
+        other change made outside the tool triggers a full rebuild.
+        """
+        index = cls()
+        current_size = os.path.getsize(filename)
+
+        try:
+            with open(index_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            size = state["size"]
+            if not fingerprint_matches(filename, size, state["fingerprint"]):
+                raise ValueError("contacts file changed outside the tool")
+            index.rows = state["rows"]
+            index.names = state["names"]
+            index.mobiles = state["mobiles"]
+            index.emails = state["emails"]
+            index.generation = state["generation"]
+        except (OSError, ValueError, KeyError):
+            # Missing, corrupt or stale index: rebuild from scratch
+            index = cls()
+            index.index_file(filename)
+            return index
+
+        index.sorted_names = sorted(index.names)
+        index.size = size
+
+        # Fold in rows appended after the index was last saved
+        if current_size > size:
+            index.index_file(filename, size)
+        return index
+
+
+def iter_records(f, pos):
+    """
+    Yield (byte offset, row) for every CSV record in binary file 'f', which
+    must already be positioned at byte 'pos'. The csv module never reads ahead,
+    so the bytes consumed before each record give its exact starting offset,
+    even when quoted fields span several lines.
+    """
+    consumed = [pos]
+
+    def lines():
+        for line in f:
+            consumed[0] += len(line)
+            yield line.decode("utf-8")
+
+    reader = csv.reader(lines())
+    while True:
+        start = consumed[0]
+        row = next(reader, None)
+        if row is None:
+            return
+        if row:
+            yield start, row
+
+
+class RowOffsets:
+    """
+    Byte offset of every data row in the contacts file, persisted to
+    OFFSETS_FILE as a packed array of 8-byte integers.
+
+    Lets the viewer seek straight to any page without reading the rows
+    before it. Uses the same fingerprint check as ContactIndex, so
+    rows appended later are scanned from the old end of the file and any
+    other change triggers a rescan.
+    """
+
+    def __init__(self):
+        self.offsets = array("Q")
+        self.size = 0  # bytes of the CSV file covered by the offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def scan(self, filename, start=0):
+        """Record the offset of every row from byte 'start' to the end of the file."""
+        with open(filename, "rb") as f:
+            f.seek(start)
+            records = iter_records(f, start)
+            if start == 0:
+                next(records, None)  # skip the header row
+            for offset, _ in records:
+                self.offsets.append(offset)
+        self.size = os.path.getsize(filename)
+
+    def save(self, filename=FILENAME, offsets_file=OFFSETS_FILE):
+        """Write the offsets to disk through a temporary file and an atomic rename."""
+        header = {"size": self.size, "fingerprint": file_fingerprint(filename, self.size)}
+        tmp_file = offsets_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            self.offsets.tofile(f)
+        os.replace(tmp_file, offsets_file)
+
+    @classmethod
+    def load(cls, filename=FILENAME, offsets_file=OFFSETS_FILE):
+        """
+        Load the saved offsets, bringing them up to date with the contacts file.
+        The result is saved again whenever rows had to be scanned.
+        """
+        row_offsets = cls()
+        current_size = os.path.getsize(filename)
+
+        try:
+            with open(offsets_file, "rb") as f:
+                header = json.loads(f.readline())
+                size = header["size"]
+                if not fingerprint_matches(filename, size, header["fingerprint"]):
+                    raise ValueError("contacts file changed outside the tool")
+                row_offsets.offsets.frombytes(f.read())
+                row_offsets.size = size
+        except (OSError, ValueError, KeyError):
+            # Missing, corrupt or stale offsets: scan the whole file
+            row_offsets = cls()
+
+        if row_offsets.size < current_size:
+            row_offsets.scan(filename, row_offsets.size)
+            row_offsets.save(filename, offsets_file)
+        return row_offsets
+
+
+# Index shared by all menu actions, loaded on first use
+_index = None
+
+
+def get_index():
+    """Return the contact index, loading or building it on first use."""
+    global _index
+    if _index is None:
+        _index = ContactIndex.load()
+    return _index
 
 
 def add_contact():
@@ -18,53 +493,219 @@ def add_contact():
     mobile = input("Mobile No.: ")
     email = input("Email ID: ")
 
-    # Open file in read mode to check for duplicate names
-    with open(FILENAME, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Case-insensitive comparison to avoid duplicate names
-            if name.lower() == row["Name"].lower():
-                print("Contact already exists.")
-                return
+    # Case-insensitive duplicate check against the name index
+    index = get_index()
+    if index.contains(name):
+        print("Contact already exists.")
+        return
+
+    # If no duplicate found, append new contact to the file
+    with open(FILENAME, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name, mobile, email])
+        print("Contact added successfully.")
+
+    # Keep the index in step with the file
+    index.add_row([name, mobile, email])
+    index.size = os.path.getsize(FILENAME)
+
+
+def import_contacts(rows):
+    """
+    Add many contacts in one go without prompting.
+
+    'rows' can hold [name, mobile, email] sequences or dicts keyed by the CSV
+    headers. The batch is checked against the index and against itself in a
+    single pass, and all new rows are appended through one buffered file handle.
+    Returns a tuple (inserted, skipped, blank): skipped counts duplicate names
+    and blank counts rows without a name.
+    """
+    index = get_index()
+    inserted = 0
+    skipped = 0
+    blank = 0
+
+    with open(FILENAME, "a", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        for row in rows:
+            if isinstance(row, dict):
+                row = [row.get(column) or "" for column in HEADER]
+            else:
+                row = (list(row) + ["", "", ""])[:3]
+
+            # Skip blank names and anything already stored or seen earlier in the batch
+            if not row[0]:
+                blank += 1
+                continue
+            if index.contains(row[0]):
+                skipped += 1
+                continue
+            writer.writerow(row)
+            index.add_row(row, keep_sorted=False)
+            inserted += 1
+
+    # Re-sort the names once for the whole batch and persist the index
+    index.sorted_names = sorted(index.names)
+    index.size = os.path.getsize(FILENAME)
+    index.save()
+    return inserted, skipped, blank
 
-        # If no duplicate found, append new contact to the file
-        with open(FILENAME, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([name, mobile, email])
-            print("Contact added successfully.")
 
+def import_contacts_file(filename):
+    """Import contacts from a CSV file that uses the same headers as FILENAME."""
+    if not os.path.exists(filename):
+        print(f"Error: {filename} does not exist.")
+        return 0, 0, 0
 
-def view_contacts():
-    """Display all contacts stored in the CSV file."""
-    with open(FILENAME, "r", encoding="utf-8") as f:
+    with open(filename, "r", newline="", encoding="utf-8") as f:
         reader = csv.reader(f)
-        rows = list(reader)
+        header = next(reader, [])
+        # Map our columns to their positions in the source file (plain lists are
+        # much cheaper to produce than DictReader rows)
+        positions = [header.index(column) if column in header else None for column in HEADER]
+        if positions == [0, 1, 2]:
+            rows = reader
+        else:
+            rows = ([row[p] if p is not None and p < len(row) else "" for p in positions]
+                    for row in reader)
+        inserted, skipped, blank = import_contacts(rows)
+    message = f"Imported {inserted} contacts, skipped {skipped} duplicates"
+    if blank:
+        message += f" and {blank} rows without a name"
+    print(message + ".")
+    return inserted, skipped, blank
+
+
+def export_contacts(filename):
+    """
+    Copy every stored contact to another CSV file, header included.
+    Rows are streamed, so the export never holds the whole file in memory.
+    Returns the number of contacts written.
+    """
+    count = 0
+    with open(FILENAME, "r", newline="", encoding="utf-8") as src, \
+            open(filename, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        writer.writerow(next(reader, HEADER))
+        for row in reader:
+            if row:
+                writer.writerow(row)
+                count += 1
+    print(f"Exported {count} contacts to {filename}")
+    return count
+
+
+def iter_contacts(offset=0, limit=None, sort_by=None, descending=False):
+    """
+    Yield contact rows lazily, skipping the first 'offset' rows and stopping
+    after 'limit' rows.
+
+    In file order the row offsets are used to seek straight to the first
+    requested row, so only the rows being returned are read. When 'sort_by'
+    names a column, the file is streamed once and only the best
+    offset + limit rows are kept in memory.
+    """
+    if sort_by is None:
+        row_offsets = RowOffsets.load()
+        if offset >= len(row_offsets):
+            return
+        with open(FILENAME, "rb") as f:
+            f.seek(row_offsets.offsets[offset])
+            records = iter_records(f, row_offsets.offsets[offset])
+            for count, (_, row) in enumerate(records):
+                if limit is not None and count >= limit:
+                    return
+                yield row
+        return
+
+    column = HEADER.index(sort_by)
+
+    def sort_key(row):
+        return row[column].casefold() if column < len(row) else ""
+
+    with open(FILENAME, "rb") as f:
+        records = iter_records(f, 0)
+        next(records, None)  # skip the header row
+        rows = (row for _, row in records)
+        if limit is None:
+            ordered = sorted(rows, key=sort_key, reverse=descending)
+        else:
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            ordered = pick(offset + limit, rows, key=sort_key)
+    yield from ordered[offset:]
+
 
-        # Check if only header row exists (no actual contacts)
-        if len(rows) < 1:
-            print("No contacts found.")
+def print_contact_row(row):
+    """Print one contact row in the table format used by the viewer."""
+    row = (list(row) + ["", "", ""])[:3]
+    print(f"{row[0]} | {row[1]} | {row[2]}")
+
+
+def view_contacts(page_size=PAGE_SIZE, sort_by=None, descending=False):
+    """
+    Display contacts one page at a time.
+    Only the rows of the current page are read from the file, so memory stays
+    flat however large the contact book grows.
+    """
+    total = len(RowOffsets.load())
+
+    # The header row doesn't count as a contact
+    if total < 1:
+        print("No contacts found.")
+        return
+
+    pages = (total + page_size - 1) // page_size
+    page = 1
+    while True:
+        print(f"--- Page {page}/{pages} ({total} contacts) ---")
+        print(" | ".join(HEADER))
+        for row in iter_contacts((page - 1) * page_size, page_size, sort_by, descending):
+            print_contact_row(row)
+
+        choice = input("[n]ext, [p]revious, page number or [q]uit: ").strip().lower()
+        if choice in ("", "n"):
+            if page == pages:
+                break
+            page += 1
+        elif choice == "p":
+            page = max(1, page - 1)
+        elif choice.isdigit() and 1 <= int(choice) <= pages:
+            page = int(choice)
+        elif choice == "q":
+            break
         else:
-            # Print each contact row in a readable format
-            for row in rows:
-                print(f"{row[0]} | {row[1]} | {row[2]}")
+            print("Invalid choice.")
+
+
+def choose_sort_column():
+    """Ask which column to sort the listing by; blank keeps file order."""
+    choice = input("Sort by (1. Name, 2. Mobile No., 3. Email ID, blank for file order): ").strip()
+    if choice in ("1", "2", "3"):
+        return HEADER[int(choice) - 1]
+    return None
 
 
 def search_contact():
-    """Search for a contact by name and display details if found."""
-    name = input("Enter name to search: ")
-    found = False
+    """
+    Search for a contact by name, mobile number or email.
+    Exact matches are shown if there are any; otherwise a ranked substring and
+    typo-tolerant search is run over all three fields.
+    """
+    term = input("Enter name, mobile or email to search: ")
+    index = get_index()
 
-    with open(FILENAME, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Case-insensitive name comparison
-            if name.lower() == row["Name"].lower():
-                print(f"🙎 Name: {row['Name']} | 📱 Mobile No.: {row['Mobile No.']}")
-                found = True
+    # Exact lookups first, then fall back to the trigram search
+    rows = index.lookup(term) or index.lookup_email(term) or index.lookup_mobile(term)
+    if not rows and term:
+        rows = index.search(term)
+
+    for row in rows:
+        print(f"🙎 Name: {row[0]} | 📱 Mobile No.: {row[1]} | 📧 Email ID: {row[2]}")
 
-        # Inform user if no matching contact was found
-        if not found:
-            print("No contact found with this name.")
+    # Inform user if no matching contact was found
+    if not rows:
+        print("No contact found with this name.")
 
 
 def main():
@@ -82,10 +723,13 @@ def main():
             case "1":
                 add_contact()
             case "2":
-                view_contacts()
+                view_contacts(sort_by=choose_sort_column())
             case "3":
                 search_contact()
             case "4":
+                # Persist the index so the next run doesn't rebuild it
+                if _index is not None:
+                    _index.save()
                 print("Exiting Contact Book. Goodbye! 👋")
                 break
             case _:
@@ -94,4 +738,26 @@ def main():
 
 # Run the main function only when this script is executed directly
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Contact Book")
+    parser.add_argument("--import", dest="import_file", metavar="FILE",
+                        help="import contacts from a CSV file and exit")
+    parser.add_argument("--export", dest="export_file", metavar="FILE",
+                        help="export all contacts to a CSV file and exit")
+    parser.add_argument("--list", action="store_true",
+                        help="print contacts without the menu (see --offset, --limit, --sort)")
+    parser.add_argument("--offset", type=int, default=0, help="rows to skip with --list")
+    parser.add_argument("--limit", type=int, default=PAGE_SIZE, help="rows to print with --list")
+    parser.add_argument("--sort", choices=HEADER, help="column to sort by with --list")
+    parser.add_argument("--desc", action="store_true", help="sort in descending order with --list")
+    args = parser.parse_args()
+
+    # Batch mode runs without the interactive menu
+    if args.import_file:
+        import_contacts_file(args.import_file)
+    if args.export_file:
+        export_contacts(args.export_file)
+    if args.list:
+        for contact in iter_contacts(args.offset, args.limit, args.sort, args.desc):
+            print_contact_row(contact)
+    if not (args.import_file or args.export_file or args.list):
+        main()
@@ -1,13 +1,661 @@
-# Global dictionary to store student names as keys and their marks as values
-students = {}
+import argparse
+import csv
+import heapq
+import importlib.util
+import json
+import math
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from itertools import islice
+from types import SimpleNamespace
+
+# NumPy is optional: when it's installed the statistics run vectorized,
+# otherwise a pure-Python fallback produces the same report
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Percentiles included in every report
+PERCENTILES = (10, 25, 50, 75, 90)
+# Number of equal-width histogram buckets between the lowest and highest marks
+HISTOGRAM_BINS = 10
+# How many students are listed in the top/bottom rankings
+TOP_K = 3
+# Number of records read and added at a time when loading from a file
+CHUNK_SIZE = 10000
+# Default column (or JSON key) names holding each student's name and marks
+NAME_COLUMN = "name"
+MARKS_COLUMN = "marks"
+# Centroid budget of the t-digest used by the streaming accumulator
+DIGEST_COMPRESSION = 100
+# Most names kept for the highest/lowest marks in the streaming accumulator
+HOLDER_LIMIT = 20
+
+
+class Gradebook:
+    """
+    Student names and marks stored side by side.
+    Marks live in a compact array of doubles (8 bytes per student) instead of
+    a dict of Python floats, and a set of names catches duplicates.
+    Records skipped while loading are counted in 'duplicates' and 'invalid'.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.marks = array("d")
+        self.seen = set()
+        self.duplicates = 0
+        self.invalid = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.seen
+
+    def add(self, name, marks):
+        """Add a student; returns False without changing anything if the name exists."""
+        if name in self.seen:
+            self.duplicates += 1
+            return False
+        self.seen.add(name)
+        self.names.append(name)
+        self.marks.append(marks)
+        return True
+
+    def add_chunk(self, records):
+        """
+        Add a list of (name, marks) records read from a file.
+        Marks are converted to floats here; records with a missing name or
+        non-numeric marks are counted as invalid and skipped.
+        """
+        seen = self.seen
+        for name, marks in records:
+            if not name:
+                self.invalid += 1
+                continue
+            if name in seen:
+                self.duplicates += 1
+                continue
+            try:
+                marks = float(marks)
+            except (TypeError, ValueError):
+                self.invalid += 1
+                continue
+            if not math.isfinite(marks):
+                self.invalid += 1  # "nan" and "inf" parse but aren't marks
+                continue
+            seen.add(name)
+            self.names.append(name)
+            self.marks.append(marks)
+
+    def items(self):
+        """Yield (name, marks) pairs in insertion order."""
+        return zip(self.names, self.marks)
+
+    @classmethod
+    def from_dict(cls, students):
+        """Build a gradebook from a {name: marks} dictionary."""
+        book = cls()
+        for name, marks in students.items():
+            book.add(name, float(marks))
+        return book
+
+
+@dataclass
+class GradeReport:
+    """Summary statistics for a cohort, as returned by compute_report()."""
+
+    count: int
+    mean: float
+    median: float
+    std_dev: float
+    highest: float
+    lowest: float
+    toppers: list = field(default_factory=list)         # names with the highest marks
+    lowest_scorers: list = field(default_factory=list)  # names with the lowest marks
+    percentiles: dict = field(default_factory=dict)     # {percentile: marks}
+    histogram: list = field(default_factory=list)       # [(from, to, count), ...]
+    top_k: list = field(default_factory=list)           # [(name, marks), ...] best first
+    bottom_k: list = field(default_factory=list)        # [(name, marks), ...] worst first
+
+
+def _report_numpy(names, marks, k, percentiles, bins):
+    """Compute the report with NumPy, working directly on the marks buffer."""
+    values = np.frombuffer(marks, dtype=np.float64)
+    highest = float(values.max())
+    lowest = float(values.min())
+
+    # One partition-based call gives the median and every requested percentile
+    qs = np.percentile(values, [50, *percentiles])
+    counts, edges = np.histogram(values, bins=bins, range=(lowest, highest))
+
+    # partition finds the k-th best/worst mark in linear time. Every index that
+    # reaches it is kept (flatnonzero returns them in insertion order), and a
+    # stable sort of just those candidates keeps ties in insertion order,
+    # like _report_python
+    k = min(k, values.size)
+    top, bottom = [], []
+    if k > 0:
+        kth_best = -np.partition(-values, k - 1)[k - 1]
+        top = np.flatnonzero(values >= kth_best)
+        top = top[np.argsort(-values[top], kind="stable")][:k].tolist()
+        kth_worst = np.partition(values, k - 1)[k - 1]
+        bottom = np.flatnonzero(values <= kth_worst)
+        bottom = bottom[np.argsort(values[bottom], kind="stable")][:k].tolist()
+
+    return GradeReport(
+        count=int(values.size),
+        mean=float(values.mean()),
+        median=float(qs[0]),
+        std_dev=float(values.std()),
+        highest=highest,
+        lowest=lowest,
+        toppers=[names[i] for i in np.flatnonzero(values == highest)],
+        lowest_scorers=[names[i] for i in np.flatnonzero(values == lowest)],
+        percentiles={p: float(q) for p, q in zip(percentiles, qs[1:])},
+        histogram=[(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(bins)],
+        top_k=[(names[i], marks[i]) for i in top],
+        bottom_k=[(names[i], marks[i]) for i in bottom],
+    )
+
+
+def _report_python(names, marks, k, percentiles, bins):
+    """Compute the same report without NumPy, from one sorted copy of the marks."""
+    count = len(marks)
+    ordered = sorted(marks)
+    lowest, highest = ordered[0], ordered[-1]
+
+    def percentile(p):
+        # Linear interpolation between closest ranks, like NumPy's default
+        pos = (count - 1) * p / 100
+        low = math.floor(pos)
+        high = min(low + 1, count - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+    mean = math.fsum(ordered) / count
+    std_dev = math.sqrt(math.fsum((x - mean) ** 2 for x in ordered) / count)
+
+    # Bucket edges match NumPy, including its widening of an empty range
+    low_edge, high_edge = (lowest, highest) if highest > lowest else (lowest - 0.5, highest + 0.5)
+    width = (high_edge - low_edge) / bins
+    edges = [low_edge + width * i for i in range(bins)] + [high_edge]
+    # Values below each edge, found by bisecting the sorted marks; the last
+    # bucket is closed so it also holds the highest marks
+    below = [bisect_left(ordered, edge) for edge in edges[:-1]] + [count]
+    histogram = [(edges[i], edges[i + 1], below[i + 1] - below[i]) for i in range(bins)]
+
+    # Ties keep insertion order in both rankings
+    top = heapq.nsmallest(k, range(count), key=lambda i: (-marks[i], i))
+    bottom = heapq.nsmallest(k, range(count), key=lambda i: (marks[i], i))
+
+    return GradeReport(
+        count=count,
+        mean=mean,
+        median=percentile(50),
+        std_dev=std_dev,
+        highest=highest,
+        lowest=lowest,
+        toppers=[name for name, score in zip(names, marks) if score == highest],
+        lowest_scorers=[name for name, score in zip(names, marks) if score == lowest],
+        percentiles={p: percentile(p) for p in percentiles},
+        histogram=histogram,
+        top_k=[(names[i], marks[i]) for i in top],
+        bottom_k=[(names[i], marks[i]) for i in bottom],
+    )
+
+
+def compute_report(students, k=TOP_K, percentiles=PERCENTILES, bins=HISTOGRAM_BINS):
+    """
+    Compute count, mean, median, standard deviation, percentiles, histogram
+    buckets and top/bottom-k rankings for a Gradebook (or {name: marks} dict).
+    Returns a GradeReport, or None when there are no students.
+    """
+    if isinstance(students, dict):
+        students = Gradebook.from_dict(students)
+    if not len(students):
+        return None
+
+    if np is not None:
+        return _report_numpy(students.names, students.marks, k, percentiles, bins)
+    return _report_python(students.names, students.marks, k, percentiles, bins)
+
+
+def iter_chunks(records, chunk_size=CHUNK_SIZE):
+    """Group an iterable into lists of at most 'chunk_size' items."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# 05_json_2_csv.py, whose incremental JSON array reader is reused here; loaded on first use
+_json_converter = None
+
+
+def json_converter():
+    """
+    Return the JSON to CSV converter script as a module. Its name starts
+    with a digit, so it is loaded by path rather than imported. (Kept
+    identical in 07_json_simplify.py.)
+    """
+    global _json_converter
+    if _json_converter is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "05_json_2_csv.py")
+        spec = importlib.util.spec_from_file_location("json_2_csv", path)
+        _json_converter = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_json_converter)
+    return _json_converter
+
+
+def read_student_records(f, fmt, name_column=NAME_COLUMN, marks_column=MARKS_COLUMN):
+    """
+    Yield (name, marks) pairs from an open text file.
+
+    'csv' expects a header row containing the name and marks columns.
+    'jsonl' reads one JSON object per line. 'json' accepts either a list of
+    objects, streamed one element at a time, or a single {name: marks}
+    object. Marks are yielded as read and
+    converted later, so bad values can be counted rather than crash the run.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(f):
+            yield row.get(name_column), row.get(marks_column)
+    elif fmt == "jsonl":
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield None, None
+                continue
+            if isinstance(record, dict):
+                yield record.get(name_column), record.get(marks_column)
+            else:
+                yield None, None
+    elif fmt == "json":
+        converter = json_converter()
+        # Read up to the first character to tell an array from an object
+        head = ""
+        while not head.strip():
+            piece = f.read(converter.READ_SIZE)
+            if not piece:
+                break
+            head += piece
+        if not head.lstrip().startswith("["):
+            # A single {name: marks} object is one document, loaded whole
+            data = json.loads(head + f.read())
+            if isinstance(data, dict):
+                yield from data.items()
+            return
+
+        # Stream the array one element at a time, starting with the text
+        # already read
+        pending = [head]
+
+        def read(size):
+            return pending.pop() if pending else f.read(size)
+
+        for record in converter.iter_json_array(SimpleNamespace(read=read)):
+            if isinstance(record, dict):
+                yield record.get(name_column), record.get(marks_column)
+            else:
+                yield None, None
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def load_students(source, fmt=None, chunk_size=CHUNK_SIZE,
+                  name_column=NAME_COLUMN, marks_column=MARKS_COLUMN, students=None):
+    """
+    Load students from a CSV, JSON or JSON Lines file ('-' reads stdin)
+    without prompting anyone.
+
+    Records are read and added in chunks of 'chunk_size'. The format is taken
+    from the file extension unless 'fmt' is given; stdin defaults to CSV.
+    Returns the Gradebook, whose 'duplicates' and 'invalid' counters tell how
+    many records were skipped.
+    """
+    if students is None:
+        students = Gradebook()
+    if fmt is None:
+        extension = os.path.splitext(source)[1].lower().lstrip(".")
+        fmt = extension if extension in ("csv", "json", "jsonl") else "csv"
+
+    if source == "-":
+        records = read_student_records(sys.stdin, fmt, name_column, marks_column)
+        for chunk in iter_chunks(records, chunk_size):
+            students.add_chunk(chunk)
+        return students
+
+    with open(source, "r", newline="", encoding="utf-8") as f:
+        records = read_student_records(f, fmt, name_column, marks_column)
+        for chunk in iter_chunks(records, chunk_size):
+            students.add_chunk(chunk)
+    return students
+
+
+class TDigest:
+    """
+    Merging t-digest: a small, mergeable summary of a distribution that
+    answers quantile and CDF queries with good accuracy near the tails.
+
+    Values are buffered and periodically folded into at most a few times
+    'compression' weighted centroids. Two digests merge by compressing their
+    centroids together, so shards can be summarized independently.
+    """
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        self.compression = compression
+        self.centroids = []  # [mean, weight] pairs sorted by mean
+        self.buffer = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1):
+        """Add one value (or a centroid of the given weight)."""
+        self.buffer.append([value, weight])
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self.buffer) >= self.compression * 10:
+            self.compress()
+
+    def _k(self, q):
+        # Scale function k1: centroids are kept small near q=0 and q=1
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k):
+        k = min(k, self.compression / 4)
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def compress(self):
+        """Fold buffered values into the centroid list."""
+        if not self.buffer:
+            return
+        items = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        merged = [items[0]]
+        weight_before = 0
+        q_limit = self._k_inverse(self._k(0) + 1)
+        for mean, weight in items[1:]:
+            current = merged[-1]
+            if (weight_before + current[1] + weight) / self.count <= q_limit:
+                # Merge into the current centroid (weighted mean)
+                current[1] += weight
+                current[0] += (mean - current[0]) * weight / current[1]
+            else:
+                weight_before += current[1]
+                q_limit = self._k_inverse(self._k(weight_before / self.count) + 1)
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def merge(self, other):
+        """Add every centroid of another digest into this one."""
+        other.compress()
+        for mean, weight in other.centroids:
+            self.buffer.append([mean, weight])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+
+    def quantile(self, q):
+        """Estimate the value below which a fraction 'q' of the data lies."""
+        self.compress()
+        if not self.centroids:
+            return math.nan
+        target = q * self.count
+        # Centroid centres sit half their weight into their cumulative range;
+        # interpolate between neighbouring centres, using min/max at the ends
+        points = [(0, self.min)]
+        cumulative = 0
+        for mean, weight in self.centroids:
+            points.append((cumulative + weight / 2, mean))
+            cumulative += weight
+        points.append((self.count, self.max))
+        for (w0, v0), (w1, v1) in zip(points, points[1:]):
+            if target <= w1:
+                return v0 if w1 == w0 else v0 + (v1 - v0) * (target - w0) / (w1 - w0)
+        return self.max
+
+    def cdf(self, value):
+        """Estimate the fraction of the data less than or equal to 'value'."""
+        self.compress()
+        if not self.centroids or value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        points = [(0, self.min)]
+        cumulative = 0
+        for mean, weight in self.centroids:
+            points.append((cumulative + weight / 2, mean))
+            cumulative += weight
+        points.append((self.count, self.max))
+        for (w0, v0), (w1, v1) in zip(points, points[1:]):
+            if value <= v1:
+                rank = w0 if v1 == v0 else w0 + (w1 - w0) * (value - v0) / (v1 - v0)
+                return rank / self.count
+        return 1.0
+
+    def to_dict(self):
+        self.compress()
+        return {"compression": self.compression, "centroids": self.centroids,
+                "count": self.count, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, state):
+        digest = cls(state["compression"])
+        digest.centroids = [list(c) for c in state["centroids"]]
+        digest.count = state["count"]
+        digest.min = state["min"]
+        digest.max = state["max"]
+        return digest
+
+
+class StudentAccumulator:
+    """
+    Constant-memory, mergeable summary of a stream of (name, marks) records.
+
+    Tracks count and sum, mean and variance with Welford's algorithm, the
+    lowest and highest marks with the students holding them, the top/bottom-k
+    students and a t-digest for percentiles. Accumulators built on separate
+    shards (even in separate processes) can be serialized with to_dict(),
+    merged in any order and turned into a GradeReport.
+
+    Unlike Gradebook it keeps no set of names, so duplicate names across the
+    stream are not detected.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.lowest = math.inf
+        self.highest = -math.inf
+        self.lowest_scorers = []
+        self.toppers = []
+        self.top_k = []     # [name, marks] candidates, trimmed to k
+        self.bottom_k = []
+        self.digest = TDigest()
+        self.invalid = 0
+
+    def add(self, name, marks):
+        """Fold one student into the summary."""
+        self.count += 1
+        self.total += marks
+        # Welford's update keeps the variance numerically stable
+        delta = marks - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (marks - self.mean)
+
+        if marks > self.highest:
+            self.highest, self.toppers = marks, [name]
+        elif marks == self.highest and len(self.toppers) < HOLDER_LIMIT:
+            self.toppers.append(name)
+        if marks < self.lowest:
+            self.lowest, self.lowest_scorers = marks, [name]
+        elif marks == self.lowest and len(self.lowest_scorers) < HOLDER_LIMIT:
+            self.lowest_scorers.append(name)
+
+        self.top_k.append([name, marks])
+        self.bottom_k.append([name, marks])
+        if len(self.top_k) >= 4 * self.k:
+            self._trim_rankings()
+        self.digest.add(marks)
+
+    def add_chunk(self, records):
+        """Add (name, marks) records read from a file, counting invalid ones."""
+        for name, marks in records:
+            try:
+                marks = float(marks)
+            except (TypeError, ValueError):
+                self.invalid += 1
+                continue
+            if not name or not math.isfinite(marks):
+                self.invalid += 1
+                continue
+            self.add(name, marks)
+
+    def _trim_rankings(self):
+        # Ties are broken by name so merged shards give a deterministic result
+        self.top_k = heapq.nsmallest(self.k, self.top_k, key=lambda item: (-item[1], item[0]))
+        self.bottom_k = heapq.nsmallest(self.k, self.bottom_k, key=lambda item: (item[1], item[0]))
+
+    def merge(self, other):
+        """Combine another accumulator into this one (Chan et al. for the variance)."""
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        self.invalid += other.invalid
+
+        if other.highest > self.highest:
+            self.highest, self.toppers = other.highest, list(other.toppers)
+        elif other.highest == self.highest:
+            self.toppers = (self.toppers + other.toppers)[:HOLDER_LIMIT]
+        if other.lowest < self.lowest:
+            self.lowest, self.lowest_scorers = other.lowest, list(other.lowest_scorers)
+        elif other.lowest == self.lowest:
+            self.lowest_scorers = (self.lowest_scorers + other.lowest_scorers)[:HOLDER_LIMIT]
+
+        self.top_k += other.top_k
+        self.bottom_k += other.bottom_k
+        self._trim_rankings()
+        self.digest.merge(other.digest)
+        return self
+
+    def to_report(self, percentiles=PERCENTILES, bins=HISTOGRAM_BINS):
+        """
+        Build a GradeReport from the summary. Median, percentiles and
+        histogram counts are t-digest estimates; everything else is exact.
+        """
+        if self.count == 0:
+            return None
+        self._trim_rankings()
+
+        low_edge, high_edge = ((self.lowest, self.highest) if self.highest > self.lowest
+                               else (self.lowest - 0.5, self.highest + 0.5))
+        width = (high_edge - low_edge) / bins
+        edges = [low_edge + width * i for i in range(bins)] + [high_edge]
+        ranks = [0] + [round(self.digest.cdf(edge) * self.count) for edge in edges[1:-1]] + [self.count]
+        histogram = [(edges[i], edges[i + 1], ranks[i + 1] - ranks[i]) for i in range(bins)]
+
+        return GradeReport(
+            count=self.count,
+            mean=self.mean,
+            median=self.digest.quantile(0.5),
+            std_dev=math.sqrt(self.m2 / self.count),
+            highest=self.highest,
+            lowest=self.lowest,
+            toppers=list(self.toppers),
+            lowest_scorers=list(self.lowest_scorers),
+            percentiles={p: self.digest.quantile(p / 100) for p in percentiles},
+            histogram=histogram,
+            top_k=[tuple(item) for item in self.top_k],
+            bottom_k=[tuple(item) for item in self.bottom_k],
+        )
+
+    def to_dict(self):
+        """Serialize the summary to a JSON-compatible dict."""
+        self._trim_rankings()
+        return {
+            "k": self.k, "count": self.count, "total": self.total,
+            "mean": self.mean, "m2": self.m2,
+            "lowest": self.lowest, "highest": self.highest,
+            "lowest_scorers": self.lowest_scorers, "toppers": self.toppers,
+            "top_k": self.top_k, "bottom_k": self.bottom_k,
+            "digest": self.digest.to_dict(), "invalid": self.invalid,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild an accumulator saved with to_dict()."""
+        acc = cls(state["k"])
+        for key in ("count", "total", "mean", "m2", "lowest", "highest",
+                    "lowest_scorers", "toppers", "invalid"):
+            setattr(acc, key, state[key])
+        acc.top_k = [list(item) for item in state["top_k"]]
+        acc.bottom_k = [list(item) for item in state["bottom_k"]]
+        acc.digest = TDigest.from_dict(state["digest"])
+        return acc
+
+
+def accumulate_file(source, fmt=None, name_column=NAME_COLUMN, marks_column=MARKS_COLUMN,
+                    chunk_size=CHUNK_SIZE):
+    """
+    Summarize one file into a StudentAccumulator and return it serialized.
+    Module-level so it can run in a worker process.
+    """
+    acc = load_students(source, fmt, chunk_size, name_column, marks_column,
+                        students=StudentAccumulator())
+    return acc.to_dict()
+
+
+def summarize_files(sources, jobs=1, fmt=None, name_column=NAME_COLUMN, marks_column=MARKS_COLUMN,
+                    chunk_size=CHUNK_SIZE):
+    """
+    Summarize several shard files, one per worker process when 'jobs' > 1,
+    and merge the results. The reduction is O(shards), not O(students).
+    """
+    worker = partial(accumulate_file, fmt=fmt, name_column=name_column,
+                     marks_column=marks_column, chunk_size=chunk_size)
+    if jobs > 1 and len(sources) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            states = list(pool.map(worker, sources))
+    else:
+        states = [worker(source) for source in sources]
+
+    total = StudentAccumulator()
+    for state in states:
+        total.merge(StudentAccumulator.from_dict(state))
+    return total
 
 
 def collect_students_data():
     """
     Continuously prompt the user to enter student names and their marks
     until the user types 'done'. Validates inputs and prevents duplicate names.
-    Returns the populated students dictionary.
+    Returns the populated Gradebook.
     """
+    students = Gradebook()
     while True:
         # Prompt for student name; 'done' exits the loop
         name = input("Enter student name (or 'done' to finish): ")
@@ -22,7 +670,7 @@ def collect_students_data():
         try:
             # Prompt for marks and convert to float
             marks = float(input(f"Enter the marks for {name}: "))
-            students[name] = marks
+            students.add(name, marks)
 
         except ValueError:
             # Handle non-numeric marks input
@@ -32,43 +680,121 @@ def collect_students_data():
     return students
 
 
-def display_students_report(students):
+def print_report(report):
+    """Print the summary part of a GradeReport."""
+    print("-" * 50)
+    print(" Student Report Card 📇 ")
+    print(f"Total Number of Students: {report.count}")
+    print(f"Average Marks of Students: {report.mean:.2f}")
+    print(f"Median Marks: {report.median:.2f}")
+    print(f"Standard Deviation: {report.std_dev:.2f}")
+    print(f"Highest Marks: {report.highest:.2f} by {', '.join(report.toppers)}")
+    print(f"Lowest Marks: {report.lowest:.2f} by {', '.join(report.lowest_scorers)}")
+    print("Percentiles: " + ", ".join(f"P{p}={value:.2f}" for p, value in report.percentiles.items()))
+    print("-" * 50)
+    print("Marks Distribution: ")
+    for low, high, count in report.histogram:
+        print(f" {low:6.2f} - {high:6.2f} : {count}")
+    print("-" * 50)
+    print(f"Top {len(report.top_k)}: " + ", ".join(f"{name} ({score:.2f})" for name, score in report.top_k))
+    print(f"Bottom {len(report.bottom_k)}: " + ", ".join(f"{name} ({score:.2f})" for name, score in report.bottom_k))
+
+
+def display_students_report(students, detailed=True):
     """
     Display a summary report of all students including:
-    total count, average, highest, and lowest marks,
-    plus a detailed list of each student and their score.
+    total count, average, median, spread, highest and lowest marks,
+    percentiles, a histogram and the top/bottom rankings, plus (optionally)
+    a detailed list of each student and their score.
+    Also accepts a StudentAccumulator, which has no per-student listing.
     """
+    if isinstance(students, StudentAccumulator):
+        report = students.to_report()
+        detailed = False
+    else:
+        report = compute_report(students)
+
     # Guard clause: do nothing if no data
-    if not students:
+    if report is None:
         print("No students data available.")
         return
 
-    # Extract all marks into a list for easy calculation
-    marks = list(students.values())
-    highest_marks = max(marks)
-    lowest_marks = min(marks)
-    average_marks = sum(marks) / len(marks)
-
-    # Find all students who achieved the highest and lowest marks
-    topper = [name for name, score in students.items() if score == highest_marks]
-    lower = [name for name, score in students.items() if score == lowest_marks]
-
     # Print formatted report header and summary statistics
-    print("-" * 50)
-    print(" Student Report Card 📇 ")
-    print(f"Total Number of Students: {len(students)}")
-    print(f"Average Marks of Students: {average_marks:.2f}")
-    print(f"Highest Marks: {highest_marks:.2f} by {', '.join(topper)}")
-    print(f"Lowest Marks: {lowest_marks:.2f} by {', '.join(lower)}")
-    print("-" * 50)
-    print("Detailed Student Report: ")
-    # Iterate through each student and print their score
-    for name, score in students.items():
-        print(f" - {name} : {score:.2f}")
+    print_report(report)
+
+    if detailed:
+        print("-" * 50)
+        print("Detailed Student Report: ")
+        # Iterate through each student and print their score
+        if isinstance(students, dict):
+            students = Gradebook.from_dict(students)
+        for name, score in students.items():
+            print(f" - {name} : {score:.2f}")
     print("-" * 50)
     print("End of Report.")
 
 
-# Main execution: collect data first, then display the report
-students = collect_students_data()
-display_students_report(students)
+def main():
+    """
+    Command-line entry point. With file arguments the report is produced
+    from those files (or stdin for '-'); without any the students are entered
+    interactively as before. --stream, --jobs, --save-state and --merge use
+    the constant-memory StudentAccumulator so shards can be summarized
+    separately and combined later.
+    """
+    parser = argparse.ArgumentParser(description="Student grade report")
+    parser.add_argument("sources", nargs="*",
+                        help="CSV, JSON or JSON Lines files with student marks ('-' for stdin)")
+    parser.add_argument("--format", choices=("csv", "json", "jsonl"),
+                        help="input format (default: from the file extension, CSV for stdin)")
+    parser.add_argument("--name-column", default=NAME_COLUMN, help="column/key holding the name")
+    parser.add_argument("--marks-column", default=MARKS_COLUMN, help="column/key holding the marks")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records read per chunk")
+    parser.add_argument("--summary", action="store_true", help="skip the per-student listing")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--stream", action="store_true",
+                        help="summarize in constant memory (approximate percentiles, no duplicate check)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes for several input files (implies --stream)")
+    parser.add_argument("--save-state", metavar="FILE",
+                        help="write the mergeable summary to FILE (implies --stream)")
+    parser.add_argument("--merge", nargs="+", metavar="STATE", default=[],
+                        help="merge summaries written with --save-state into the report")
+    args = parser.parse_args()
+
+    streaming = args.stream or args.jobs > 1 or args.save_state or args.merge
+    if not args.sources and not args.merge:
+        students = collect_students_data()
+    elif streaming:
+        students = summarize_files(args.sources, args.jobs, args.format, args.name_column,
+                                   args.marks_column, args.chunk_size)
+        for state_file in args.merge:
+            with open(state_file, "r", encoding="utf-8") as f:
+                students.merge(StudentAccumulator.from_dict(json.load(f)))
+        if args.save_state:
+            with open(args.save_state, "w", encoding="utf-8") as f:
+                json.dump(students.to_dict(), f)
+    else:
+        students = Gradebook()
+        for source in args.sources:
+            load_students(source, args.format, args.chunk_size,
+                          args.name_column, args.marks_column, students=students)
+
+    duplicates = getattr(students, "duplicates", 0)
+    if duplicates or students.invalid:
+        print(f"Skipped {duplicates} duplicate and {students.invalid} invalid records.",
+              file=sys.stderr)
+
+    if args.json:
+        if isinstance(students, StudentAccumulator):
+            report = students.to_report()
+        else:
+            report = compute_report(students)
+        print(json.dumps(asdict(report) if report else None, indent=2))
+    else:
+        display_students_report(students, detailed=not args.summary)
+
+
+# Run the report only when this script is executed directly
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,260 @@
 import os
+import re
 import json
+import math
+import bisect
+from itertools import islice
 
-# Name of the JSON file that stores all movie data
+# Name of the JSON file that stores the movie snapshot
 FILENAME = "movies.json"
+# Append-only log of movies added since the last snapshot (one JSON object per line)
+LOG_FILE = "movies.log.jsonl"
+# Fold the log into a fresh snapshot once it holds this many entries
+COMPACT_EVERY = 1000
+
+# Separators between genres in a genre string such as "Action / Crime"
+GENRE_SEPARATORS = re.compile(r"[/,|&]")
+# Words of a title used by the partial-title index
+WORD = re.compile(r"\w+")
+
+# Number of entries currently in the log, kept up to date by load/append/compact
+log_entries = 0
+
+
+def split_genres(genre):
+    """
+    Split a genre string like 'Action / Crime' into folded genre names,
+    each listed once even if the string repeats it.
+    """
+    parts = (part.strip().casefold() for part in GENRE_SEPARATORS.split(genre))
+    return list(dict.fromkeys(part for part in parts if part))
+
+
+def title_tokens(title):
+    """Return the folded words of a movie title."""
+    return WORD.findall(title.casefold())
+
+
+class MovieIndex:
+    """
+    Lookup tables kept alongside the movie list, keyed by movie id (the
+    movie's position in the list).
+
+    - titles: folded title -> movie id, for O(1) duplicate checks
+    - genres: folded genre -> movie ids, an inverted index over every genre
+      a movie lists
+    - tokens: folded title word -> movie ids, with a sorted word list so
+      partial titles are found by prefix instead of scanning every title
+    - ratings: (rating, movie id) pairs kept sorted, overall and per genre,
+      so rating ranges and top-N lists are found with bisect
+    """
+
+    def __init__(self):
+        self.titles = {}
+        self.genres = {}
+        self.tokens = {}
+        self.sorted_tokens = []
+        self.ratings = []
+        self.genre_ratings = {}
+
+    @classmethod
+    def build(cls, movies):
+        """Index a whole movie list at once."""
+        index = cls()
+        for movie_id, movie in enumerate(movies):
+            index.add(movie_id, movie, keep_sorted=False)
+        index.sorted_tokens = sorted(index.tokens)
+        index.ratings.sort()
+        for pairs in index.genre_ratings.values():
+            pairs.sort()
+        return index
+
+    def add(self, movie_id, movie, keep_sorted=True):
+        """
+        Index one movie. Bulk builders pass keep_sorted=False and sort the
+        word and rating lists once at the end.
+        """
+        insert = bisect.insort if keep_sorted else list.append
+        pair = (movie["rating"], movie_id)
+        self.titles[movie["title"].casefold()] = movie_id
+        insert(self.ratings, pair)
+        for genre in split_genres(movie["genre"]):
+            self.genres.setdefault(genre, []).append(movie_id)
+            insert(self.genre_ratings.setdefault(genre, []), pair)
+        for token in set(title_tokens(movie["title"])):
+            if token not in self.tokens:
+                self.tokens[token] = []
+                if keep_sorted:
+                    bisect.insort(self.sorted_tokens, token)
+            self.tokens[token].append(movie_id)
+
+    def has_title(self, title):
+        """Return True if a movie with this title (any case) is indexed."""
+        return title.casefold() in self.titles
+
+    def by_genre(self, genre):
+        """Return the ids of movies listing exactly this genre (any case)."""
+        return list(self.genres.get(genre.strip().casefold(), []))
+
+    def _words_starting_with(self, prefix):
+        """Return the ids of movies with a title word starting with 'prefix'."""
+        ids = set()
+        pos = bisect.bisect_left(self.sorted_tokens, prefix)
+        while pos < len(self.sorted_tokens) and self.sorted_tokens[pos].startswith(prefix):
+            ids.update(self.tokens[self.sorted_tokens[pos]])
+            pos += 1
+        return ids
+
+    def _rating_list(self, genre):
+        # The overall list, or the one for a single genre (empty if unknown)
+        if genre is None:
+            return self.ratings
+        return self.genre_ratings.get(genre.strip().casefold(), [])
+
+    def rating_range(self, low, high, genre=None, descending=False):
+        """
+        Yield ids of movies rated between 'low' and 'high' (inclusive),
+        optionally limited to one genre, ordered by rating. Finding the range
+        is O(log N); each result after that costs O(1).
+        """
+        pairs = self._rating_list(genre)
+        start = bisect.bisect_left(pairs, (low, -1))
+        stop = bisect.bisect_right(pairs, (high, math.inf))
+        positions = range(stop - 1, start - 1, -1) if descending else range(start, stop)
+        for pos in positions:
+            yield pairs[pos][1]
+
+    def by_rating(self, genre=None, descending=True):
+        """Stream movie ids ordered by rating, best first unless descending=False."""
+        pairs = self._rating_list(genre)
+        for _, movie_id in (reversed(pairs) if descending else pairs):
+            yield movie_id
+
+    def top_rated(self, count, genre=None):
+        """Return the ids of the 'count' best rated movies, optionally within one genre."""
+        return list(islice(self.by_rating(genre), count))
+
+    def search(self, term):
+        """
+        Return ids of movies matching a search term, in catalog order.
+
+        A title matches when every word of the term starts one of its words
+        ('kho hun' finds 'Khoj: The Hunt'). A genre matches when its name
+        contains the term; there are few distinct genres, so they are scanned.
+        """
+        words = title_tokens(term)
+        ids = set()
+        if words:
+            ids = self._words_starting_with(words[0])
+            for word in words[1:]:
+                ids &= self._words_starting_with(word)
+
+        folded = term.strip().casefold()
+        if folded:
+            for genre, genre_ids in self.genres.items():
+                if folded in genre:
+                    ids.update(genre_ids)
+        return sorted(ids)
 
 
 def load_movies():
     """
-    Load the list of movies from the JSON file.
-    If the file doesn't exist yet, return an empty list.
+    Load the list of movies from the snapshot and replay the append log on top,
+    then index them. Returns a (movies, index) pair; both are empty if neither
+    file exists yet.
     """
-    if not os.path.exists(FILENAME):
+    global log_entries
+    movies = []
+    if os.path.exists(FILENAME):
+        # Open and read the JSON snapshot
+        with open(FILENAME, "r", encoding="utf-8") as f:
+            movies = json.load(f)
+    elif not os.path.exists(LOG_FILE):
         print("No Movies File Found.")
-        return []
+        return [], MovieIndex()
 
-    # Open and read the JSON file, then return the parsed list
-    with open(FILENAME, "r", encoding="utf-8") as f:
-        return json.load(f)
+    index = MovieIndex.build(movies)
 
+    # Replay movies added after the snapshot was written. Titles already in the
+    # snapshot are skipped, which covers a crash between writing a snapshot and
+    # clearing the log.
+    log_entries = 0
+    if os.path.exists(LOG_FILE):
+        with open(LOG_FILE, "rb+") as f:
+            end = 0
+            for line in f:
+                start, end = end, end + len(line)
+                try:
+                    movie = json.loads(line)
+                except ValueError:
+                    if not line.endswith(b"\n"):
+                        # A torn last line from an interrupted write: cut it
+                        # off so the next append starts on a fresh line
+                        f.truncate(start)
+                    # A damaged line in the middle; keep what follows it
+                    continue
+                if not line.endswith(b"\n"):
+                    # A complete last entry missing only its line break
+                    f.write(b"\n")
+                log_entries += 1
+                if not index.has_title(movie["title"]):
+                    index.add(len(movies), movie)
+                    movies.append(movie)
+    return movies, index
 
-def save_movie(movie):
+
+def save_movie(movies):
     """
-    Save the entire list of movies back to the JSON file.
-    This overwrites the existing file with the updated list.
+    Save the entire list of movies as a new snapshot.
+    The list is written to a temporary file, flushed to disk and renamed over
+    the old snapshot, so a crash never leaves a half-written movies.json.
     """
-    with open(FILENAME, "w", encoding="utf-8") as f:
-        json.dump(movie, f, indent=2)
-        print("Movie Added Successfully. ✅")
+    tmp_file = FILENAME + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(movies, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, FILENAME)
 
 
-def add_movie(movies):
+def append_movie(movie):
+    """
+    Record a single new movie by appending one line to the log.
+    This costs the same no matter how large the catalog is.
+    """
+    global log_entries
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(movie) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    log_entries += 1
+
+
+def compact_movies(movies):
+    """
+    Write a fresh snapshot of all movies and clear the log it replaces.
+    Does nothing when the log is already empty.
+    """
+    global log_entries
+    if log_entries == 0:
+        return
+    save_movie(movies)
+    # The snapshot now holds every logged movie, so the log can start over
+    with open(LOG_FILE, "w", encoding="utf-8"):
+        pass
+    log_entries = 0
+
+
+def add_movie(movies, index):
     """
     Prompt the user for a new movie's details and add it to the list.
-    Checks for duplicate titles and validates the rating.
+    Checks for duplicate titles and validates the rating, then records the
+    movie in the append log.
     """
     title = input("Enter Movie Title: ").strip()
 
-    # Prevent duplicate titles (case-insensitive check)
-    if any(movie["title"].lower() == title.lower() for movie in movies):
+    # Prevent duplicate titles (case-insensitive check against the index)
+    if index.has_title(title):
         print("Movie with this title already exists.")
         return
 
@@ -54,8 +271,14 @@ def add_movie(movies):
 
     # Create new movie dictionary and append to the list
     new_movie = {"title": title, "genre": genre, "rating": rating}
+    index.add(len(movies), new_movie)
     movies.append(new_movie)
-    save_movie(movies)
+    append_movie(new_movie)
+    print("Movie Added Successfully. ✅")
+
+    # Periodically fold the log into the snapshot so startup replay stays short
+    if log_entries >= COMPACT_EVERY:
+        compact_movies(movies)
 
 
 def view_movies(movies):
@@ -73,21 +296,38 @@ def view_movies(movies):
     print("-" * 40)
 
 
-def search_movie(movies):
+def search_movie(movies, index):
     """
-    Search for movies by title or genre (partial, case-insensitive match).
+    Search for movies by title words or genre (partial, case-insensitive match).
     Displays matching results using the same format as view_movies.
     """
     search_term = input("Enter Title or Genre to Search: ").strip()
 
-    # Collect movies whose title or genre contains the search term
-    results = [
-        movie
-        for movie in movies
-        if search_term.lower() in movie["title"].lower()
-        or search_term.lower() in movie["genre"].lower()
-    ]
+    # Look the term up in the title-word and genre indexes
+    results = [movies[movie_id] for movie_id in index.search(search_term)]
+
+    if not results:
+        print("No Movies Found.")
+        return
+    view_movies(results)
+
+
+def browse_by_rating(movies, index):
+    """
+    Show the best rated movies, optionally limited to a genre and a rating
+    range, straight from the sorted rating index.
+    """
+    genre = input("Genre (leave blank for all): ").strip() or None
+    try:
+        low = float(input("Minimum Rating (default 0): ").strip() or 0)
+        high = float(input("Maximum Rating (default 10): ").strip() or 10)
+        count = int(input("How many movies (default 20): ").strip() or 20)
+    except ValueError:
+        print("Invalid input. Please enter numbers only.")
+        return
 
+    ids = islice(index.rating_range(low, high, genre, descending=True), count)
+    results = [movies[movie_id] for movie_id in ids]
     if not results:
         print("No Movies Found.")
         return
@@ -100,28 +340,33 @@ def run_movie_db():
     Presents a menu and handles user choices.
     """
     # Load existing movies at startup
-    movies = load_movies()
+    movies, index = load_movies()
 
     print("Welcome to the Movie Database!")
     while True:
         print("1. Add Movie")
         print("2. View All Movies")
         print("3. Search Movie by Title or Genre")
-        print("4. Exit")
+        print("4. Top Rated Movies by Genre and Rating")
+        print("5. Exit")
 
-        choice = input("Enter your choice (1-4): ")
+        choice = input("Enter your choice (1-5): ")
         match choice:
             case "1":
-                add_movie(movies)
+                add_movie(movies, index)
             case "2":
                 view_movies(movies)
             case "3":
-                search_movie(movies)
+                search_movie(movies, index)
             case "4":
+                browse_by_rating(movies, index)
+            case "5":
+                # Leave a compact snapshot behind for the next start
+                compact_movies(movies)
                 print("Exiting Movie Database. Goodbye!")
                 break
             case _:
-                print("Invalid choice. Please enter a number between 1-4.")
+                print("Invalid choice. Please enter a number between 1-5.")
 
 
 # Run the program only when this script is executed directly
@@ -1,17 +1,997 @@
 # Import standard libraries for file handling, CSV operations, date/time, and HTTP requests
 import os
+import io
+import math
 import csv
-from datetime import datetime
+import json
+import hashlib
+import time
+import queue
+import random
+import signal
+import argparse
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict, deque
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import requests
+from requests.adapters import HTTPAdapter
 
 # Configuration constants
 FILENAME = "weather.csv"  # Name of the CSV file where weather logs are stored
-API_KEY = "Enter your OpenWeatherMap API key here"  # OpenWeatherMap API key
+API_KEY = os.environ.get("OPENWEATHER_API_KEY", "Enter your OpenWeatherMap API key here")  # OpenWeatherMap API key
+# Current weather endpoint; point it at a local stub server for testing
+API_URL = os.environ.get("OPENWEATHER_API_URL", "https://api.openweathermap.org/data/2.5/weather")
+REQUEST_TIMEOUT = 10      # Seconds to wait for a connection or a response
+MAX_RETRIES = 3           # Extra attempts after a timeout, connection error, 429 or 5xx
+BACKOFF_SECONDS = 0.5     # First retry delay; doubles on every further attempt
+MAX_WORKERS = 8           # Concurrent requests in batch mode
+RATE_LIMIT = 60           # Requests allowed per RATE_PERIOD (free plan: 60 per minute)
+RATE_PERIOD = 60.0        # Seconds
+UNITS = "metric"          # Units requested from the API (°C)
+CACHE_SIZE = 1024         # Responses kept in the in-memory cache
+CACHE_TTL = 600           # Seconds a cached response counts as fresh
+CACHE_STALE_TTL = 1800    # Further seconds a stale response is served while it refreshes
+CACHE_DB = "weather_cache.sqlite"  # Default file for the optional on-disk cache
+INDEX_FILE = "weather.idx.json"    # (date, city) pairs already logged, for duplicate checks
+RECENT_DAYS = 7           # Days of (date, city) pairs kept in the index
+FINGERPRINT_BYTES = 4096  # Bytes hashed to detect edits made to the log outside the tool
+# Where logs are kept: "csv" (the single weather.csv), "monthly" (one CSV per
+# month) or "columnar" (one directory of binary column files per month)
+STORAGE = os.environ.get("WEATHER_STORAGE", "csv")
+PARTITION_DIR = "weather_logs"  # Directory holding the month partitions
+MIGRATE_BATCH = 100000    # Rows copied per write when migrating weather.csv
+COLUMNS = ("Date", "City", "Temperature", "Condition")
+# Array typecodes of the columnar format: day ordinal, city id, °C, condition id
+COLUMN_TYPES = {"Date": "i", "City": "I", "Temperature": "d", "Condition": "I"}
+COLLECT_INTERVAL = 3600   # Seconds between collector rounds
+FLUSH_ROWS = 100          # Collector writes its buffer once this many rows are waiting...
+FLUSH_SECONDS = 30        # ...or once this many seconds have passed
+METRICS_FILE = "collector_metrics.json"  # Health metrics written by the collector
 
-# Create (or overwrite) the CSV file and write the header row
-with open(FILENAME, "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Date", "City", "Temperature", "Condition"])
+# Create the CSV file with its header row if it doesn't exist yet; existing
+# history is kept and new logs are appended to it
+if not os.path.exists(FILENAME):
+    with open(FILENAME, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "City", "Temperature", "Condition"])
+
+
+class WeatherError(Exception):
+    """Raised when the weather for a city can't be fetched."""
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window limiter allowing at most 'rate' calls in any
+    'period' seconds. acquire() blocks until a call is allowed, so worker
+    threads share one quota. (A full token bucket would let up to twice the
+    quota through in the first period.)
+    """
+
+    def __init__(self, rate=RATE_LIMIT, period=RATE_PERIOD):
+        self.rate = rate
+        self.period = period
+        self.calls = deque()  # times of the calls made in the last 'period' seconds
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.rate:
+                    self.calls.append(now)
+                    return
+                # Wait until the oldest call in the window expires
+                wait = self.calls[0] + self.period - now
+            time.sleep(wait)
+
+
+class MemoryTier:
+    """In-process LRU cache tier holding up to 'max_entries' responses."""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (value, stored_at)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stored_at):
+        with self.lock:
+            self.entries[key] = (value, stored_at)
+            self.entries.move_to_end(key)
+            # Drop the least recently used entries once the cache is full
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class SQLiteTier:
+    """On-disk cache tier shared by every process that uses the same file."""
+
+    def __init__(self, path=CACHE_DB):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS weather_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, stored_at FROM weather_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (tuple(json.loads(row[0])), row[1]) if row else None
+
+    def set(self, key, value, stored_at):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO weather_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at),
+            )
+
+
+def cache_key(city, units=UNITS):
+    """Normalize a city name (case and spacing) and combine it with the units."""
+    return f"{' '.join(city.casefold().split())}|{units}"
+
+
+class WeatherCache:
+    """
+    Response cache in front of the weather API, made of one or more tiers
+    checked in order (by default an in-memory LRU; add a SQLiteTier to share
+    responses between runs and jobs). Any object with get(key) and
+    set(key, value, stored_at) can be used as a tier.
+
+    Entries younger than 'ttl' seconds are served as they are. Entries up to
+    'stale_ttl' seconds past that are still served, while a background thread
+    fetches a fresh copy. Hits, stale hits and misses are counted.
+    """
+
+    def __init__(self, tiers=None, ttl=CACHE_TTL, stale_ttl=CACHE_STALE_TTL):
+        self.tiers = tiers if tiers is not None else [MemoryTier()]
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshing = set()
+        self.lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        Return (value, age in seconds) of the newest usable entry, or None.
+        An entry found in a slower tier is copied into the faster ones.
+        """
+        now = time.time()
+        for position, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is None or now - entry[1] > self.ttl + self.stale_ttl:
+                continue
+            for faster in self.tiers[:position]:
+                faster.set(key, entry[0], entry[1])
+            return entry[0], now - entry[1]
+        return None
+
+    def store(self, key, value):
+        """Save a fresh value in every tier."""
+        stored_at = time.time()
+        for tier in self.tiers:
+            tier.set(key, value, stored_at)
+
+    def get_or_fetch(self, key, fetch, refresh=None):
+        """
+        Return the cached value for 'key', calling fetch() on a miss.
+        A stale value is returned immediately and refreshed in the background
+        with refresh() (fetch() unless given).
+        """
+        entry = self.lookup(key)
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            value = fetch()
+            self.store(key, value)
+            return value
+
+        value, age = entry
+        if age <= self.ttl:
+            with self.lock:
+                self.hits += 1
+            return value
+
+        with self.lock:
+            self.stale_hits += 1
+            # Only one refresh per key at a time
+            start = key not in self.refreshing
+            self.refreshing.add(key)
+        if start:
+            threading.Thread(target=self._refresh, args=(key, refresh or fetch), daemon=True).start()
+        return value
+
+    def _refresh(self, key, fetch):
+        try:
+            self.store(key, fetch())
+        except WeatherError:
+            pass  # keep serving the stale value; the next lookup retries
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+    def stats(self):
+        """Return the hit/miss counters as a dict."""
+        with self.lock:
+            return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+# Cache used by the interactive menu and batch mode unless another one is passed in
+default_cache = WeatherCache()
+
+
+def make_session(pool_size=MAX_WORKERS):
+    """
+    Create a requests session whose connection pool is large enough for every
+    worker, so connections are kept alive and reused between cities.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_weather(city, session=None, limiter=None, api_url=API_URL,
+                  timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, cache=None, units=UNITS):
+    """
+    Fetch the current temperature and condition for a city.
+
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff (honouring a Retry-After header when present); other
+    errors such as an unknown city fail straight away. When a cache is given
+    it is consulted first and filled on a miss; errors are never cached.
+    Returns a (temperature, condition) tuple or raises WeatherError.
+    """
+    if cache is not None:
+        def fetch(session=session):
+            return fetch_weather(city, session, limiter, api_url, timeout, retries, None, units)
+        # A miss is fetched over the caller's session; background refreshes
+        # may outlive it, so they use a plain request
+        return cache.get_or_fetch(cache_key(city, units), fetch, refresh=lambda: fetch(None))
+
+    session = session or requests
+    params = {"q": city, "appid": API_KEY, "units": units}
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        delay = BACKOFF_SECONDS * 2 ** attempt * (1 + random.random() / 2)
+        try:
+            response = session.get(api_url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            error = WeatherError(f"Network error: {e}")
+        except requests.RequestException as e:
+            # An invalid URL and the like won't get better with a retry
+            raise WeatherError(f"Request failed: {e}")
+        else:
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                    # Extract temperature and weather condition from the JSON response
+                    return data["main"]["temp"], data["weather"][0]["main"]
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    raise WeatherError(f"Unexpected response: {e}")
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict):
+                message = body.get("message", "Unknown error")
+            else:
+                message = response.reason or "Unknown error"
+            error = WeatherError(f"Error: {message}")
+            if response.status_code != 429 and response.status_code < 500:
+                raise error
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+
+        if attempt < retries:
+            time.sleep(delay)
+    raise error
+
+
+def fetch_many(cities, workers=MAX_WORKERS, api_url=API_URL, timeout=REQUEST_TIMEOUT,
+               retries=MAX_RETRIES, rate=RATE_LIMIT, period=RATE_PERIOD, cache=None):
+    """
+    Fetch the weather for many cities concurrently over one pooled session.
+    Requests are spread over a bounded thread pool and share one rate limiter
+    (and the cache, if given). Returns a list of
+    (city, (temperature, condition) or WeatherError) in the order the cities
+    were given.
+    """
+    limiter = RateLimiter(rate, period)
+
+    def fetch(city):
+        try:
+            return city, fetch_weather(city, session, limiter, api_url, timeout, retries, cache)
+        except WeatherError as e:
+            return city, e
+
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fetch, cities))
+
+
+def file_fingerprint(filename, size):
+    """
+    Fingerprint the first 'size' bytes of a file for fingerprint_matches():
+    a hash of the last FINGERPRINT_BYTES bytes before 'size' and the file's
+    modification time. (Kept identical in 00_contact_vault.py,
+    03_temp_trail.py and 04_graph_craft.py.)
+    """
+    with open(filename, "rb") as f:
+        start = max(0, size - FINGERPRINT_BYTES)
+        f.seek(start)
+        digest = hashlib.sha1(f.read(size - start)).hexdigest()
+        return [digest, os.fstat(f.fileno()).st_mtime_ns]
+
+
+def fingerprint_matches(filename, size, fingerprint):
+    """
+    Return True if the first 'size' bytes of a file are unchanged since
+    'fingerprint' was taken, so only the bytes after them need reading. A
+    file that grew only has the hashed tail compared (appending updates the
+    modification time); one of the same size must also keep its modification
+    time, which catches same-length edits away from the tail.
+    """
+    if not isinstance(fingerprint, list) or len(fingerprint) != 2:
+        return False  # missing, or saved by an older version
+    current_size = os.path.getsize(filename)
+    if size > current_size:
+        return False
+    with open(filename, "rb") as f:
+        if size == current_size and os.fstat(f.fileno()).st_mtime_ns != fingerprint[1]:
+            return False
+        start = max(0, size - FINGERPRINT_BYTES)
+        f.seek(start)
+        return hashlib.sha1(f.read(size - start)).hexdigest() == fingerprint[0]
+
+
+class LogIndex:
+    """
+    Set of (date, city) pairs already in the weather log, for constant-time
+    "already logged today?" checks.
+
+    Only the last RECENT_DAYS days are kept, so the index stays the same size
+    however long the history grows. It is saved to INDEX_FILE along with the
+    number of log bytes it covers; rows appended later are picked up by
+    reading only the new tail, and any other change to the log triggers a
+    rescan.
+    """
+
+    def __init__(self):
+        self.days = {}  # date -> set of case-folded cities
+        self.size = 0   # bytes of the log covered by the index
+
+    def add(self, date, city):
+        self.days.setdefault(date, set()).add(city.casefold())
+
+    def is_logged(self, date, city):
+        """Return True if the city was logged on this (recent) date."""
+        return city.casefold() in self.days.get(date, ())
+
+    def scan(self, filename, start=0):
+        """Index the rows of the log from byte offset 'start' to the end."""
+        cutoff = self.cutoff()
+        with open(filename, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        if start == 0:
+            next(reader, None)  # skip the header row
+        for row in reader:
+            if len(row) >= 2 and row[0] >= cutoff:
+                self.add(row[0], row[1])
+        self.size = start + len(data)
+
+    @staticmethod
+    def cutoff():
+        # ISO dates compare correctly as strings
+        return (date.today() - timedelta(days=RECENT_DAYS)).isoformat()
+
+    def save(self, filename=FILENAME, index_file=INDEX_FILE):
+        """Drop days that are too old and write the index atomically."""
+        cutoff = self.cutoff()
+        self.days = {day: cities for day, cities in self.days.items() if day >= cutoff}
+        state = {
+            "size": self.size,
+            "fingerprint": file_fingerprint(filename, self.size),
+            "days": {day: sorted(cities) for day, cities in self.days.items()},
+        }
+        tmp_file = index_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_file, index_file)
+
+    @classmethod
+    def load(cls, filename=FILENAME, index_file=INDEX_FILE):
+        """Load the saved index and bring it up to date with the log."""
+        index = cls()
+        current_size = os.path.getsize(filename)
+        try:
+            with open(index_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            size = state["size"]
+            if not fingerprint_matches(filename, size, state["fingerprint"]):
+                raise ValueError("weather log changed outside the tool")
+            index.days = {day: set(cities) for day, cities in state["days"].items()}
+            index.size = size
+        except (OSError, ValueError, KeyError):
+            # Missing, corrupt or stale index: rescan the whole log
+            index = cls()
+
+        if index.size < current_size:
+            index.scan(filename, index.size)
+            index.save(filename, index_file)
+        return index
+
+
+def month_of(day):
+    """Return the 'YYYY-MM' partition a 'YYYY-MM-DD' date belongs to."""
+    return day[:7]
+
+
+def partition_months(start=None, end=None):
+    """
+    List the month partitions under PARTITION_DIR that can hold rows dated
+    between 'start' and 'end' (inclusive, either may be None), oldest first.
+    """
+    if not os.path.isdir(PARTITION_DIR):
+        return []
+    months = set()
+    for name in os.listdir(PARTITION_DIR):
+        month = name[:7]
+        if len(month) == 7 and month[4] == "-":
+            months.add(month)
+    return sorted(month for month in months
+                  if (start is None or month >= month_of(start))
+                  and (end is None or month <= month_of(end)))
+
+
+def read_json_file(path, default):
+    """Return the parsed contents of a JSON file, or 'default' if it's missing."""
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def end_last_line(path):
+    """
+    Add a line break to the end of the file if its last line has none (the
+    shipped weather.csv ends that way), so appended rows don't merge into it.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) not in (b"\n", b"\r"):
+            f.write(b"\n")
+
+
+def append_monthly(rows):
+    """Append rows to one CSV file per month, writing each file's header when new."""
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(month_of(row[0]), []).append(row)
+    for month, month_rows in by_month.items():
+        path = os.path.join(PARTITION_DIR, f"{month}.csv")
+        new_file = not os.path.exists(path)
+        end_last_line(path)
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(COLUMNS)
+            writer.writerows(month_rows)
+
+
+def append_columnar(rows):
+    """
+    Append rows to one directory per month holding one fixed-width binary
+    file per column: dates as day ordinals, temperatures as doubles, and
+    cities/conditions as ids into small per-month JSON dictionaries.
+    """
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(month_of(row[0]), []).append(row)
+
+    for month, month_rows in by_month.items():
+        path = os.path.join(PARTITION_DIR, month)
+        os.makedirs(path, exist_ok=True)
+        columns = {name: array(typecode) for name, typecode in COLUMN_TYPES.items()}
+        dictionaries = {}
+        for name in ("City", "Condition"):
+            values = read_json_file(os.path.join(path, f"{name}.json"), [])
+            dictionaries[name] = (values, {value: i for i, value in enumerate(values)})
+
+        for day, city, temp, condition in month_rows:
+            columns["Date"].append(date.fromisoformat(day).toordinal())
+            columns["Temperature"].append(float(temp))
+            for name, value in (("City", city), ("Condition", condition)):
+                values, ids = dictionaries[name]
+                if value not in ids:
+                    ids[value] = len(values)
+                    values.append(value)
+                columns[name].append(ids[value])
+
+        # Dictionaries are replaced before the columns grow, so every id a
+        # reader can see already has its entry
+        for name, (values, _) in dictionaries.items():
+            tmp_file = os.path.join(path, f"{name}.json.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(values, f)
+            os.replace(tmp_file, os.path.join(path, f"{name}.json"))
+        for name, values in columns.items():
+            with open(os.path.join(path, f"{name}.bin"), "ab") as f:
+                values.tofile(f)
+
+
+def read_columnar(month, start, end, city, columns):
+    """
+    Yield rows of one columnar month partition, reading only the column
+    files that are needed to filter and to return 'columns'.
+    """
+    path = os.path.join(PARTITION_DIR, month)
+    needed = set(columns) | {"Date"} | ({"City"} if city else set())
+    data = {}
+    for name in needed:
+        values = array(COLUMN_TYPES[name])
+        with open(os.path.join(path, f"{name}.bin"), "rb") as f:
+            values.frombytes(f.read())
+        data[name] = values
+    # A write cut short can leave columns of different lengths; use the rows
+    # present in all of them
+    count = min(len(values) for values in data.values())
+
+    dictionaries = {name: read_json_file(os.path.join(path, f"{name}.json"), [])
+                    for name in ("City", "Condition") if name in needed}
+    first = date.fromisoformat(start).toordinal() if start else -1
+    last = date.fromisoformat(end).toordinal() if end else math.inf
+    city_ids = None
+    if city:
+        city_ids = {i for i, name in enumerate(dictionaries["City"]) if name.casefold() == city.casefold()}
+
+    dates = data["Date"]
+    for i in range(count):
+        if not first <= dates[i] <= last:
+            continue
+        if city_ids is not None and data["City"][i] not in city_ids:
+            continue
+        row = {}
+        for name in columns:
+            if name == "Date":
+                row[name] = date.fromordinal(dates[i]).isoformat()
+            elif name in dictionaries:
+                row[name] = dictionaries[name][data[name][i]]
+            else:
+                row[name] = data[name][i]
+        yield row
+
+
+def read_csv_rows(path, start, end, city, columns):
+    """Yield rows of a CSV log file between two dates, for one city if given."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            day = row.get("Date") or ""
+            if (start and day < start) or (end and day > end):
+                continue
+            if city and (row.get("City") or "").casefold() != city.casefold():
+                continue
+            yield {name: row.get(name) for name in columns}
+
+
+def read_logs(start=None, end=None, city=None, columns=COLUMNS, storage=None):
+    """
+    Yield weather log rows as dicts limited to 'columns', dated between
+    'start' and 'end' ('YYYY-MM-DD', inclusive) and optionally for one city.
+
+    With partitioned storage only the months overlapping the range are
+    opened, and the columnar format reads only the columns involved, so
+    recent queries cost the same however long the history is. The
+    single-file layout has to read the whole log. Temperatures come back as
+    floats from the columnar format and as stored text otherwise.
+    """
+    storage = storage or STORAGE
+    if storage == "csv":
+        if os.path.exists(FILENAME):
+            yield from read_csv_rows(FILENAME, start, end, city, columns)
+        return
+
+    for month in partition_months(start, end):
+        if storage == "columnar":
+            if os.path.isdir(os.path.join(PARTITION_DIR, month)):
+                yield from read_columnar(month, start, end, city, columns)
+        else:
+            path = os.path.join(PARTITION_DIR, f"{month}.csv")
+            if os.path.exists(path):
+                yield from read_csv_rows(path, start, end, city, columns)
+
+
+def migrate_logs(storage):
+    """
+    Copy every row of the single weather.csv file into the given partitioned
+    storage layout ('monthly' or 'columnar'). Returns the number of rows copied,
+    or None when PARTITION_DIR already holds partitions: appending the whole
+    file again would duplicate every row, so a second migration is refused.
+    """
+    if partition_months():
+        print(f"{PARTITION_DIR}/ already holds month partitions; move it away to migrate again.")
+        return None
+    append = append_columnar if storage == "columnar" else append_monthly
+    count = 0
+    with open(FILENAME, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        while True:
+            rows = []
+            for row in reader:
+                # Skip rows that don't have all four columns or a usable temperature
+                if len(row) >= 4:
+                    try:
+                        float(row[2])
+                        date.fromisoformat(row[0])
+                    except ValueError:
+                        continue
+                    rows.append(row[:4])
+                if len(rows) >= MIGRATE_BATCH:
+                    break
+            if not rows:
+                break
+            append(rows)
+            count += len(rows)
+    print(f"Copied {count} rows into {storage} storage under {PARTITION_DIR}/")
+    return count
+
+
+# Index shared by every logging call, loaded on first use
+_log_index = None
+
+
+def get_log_index():
+    """Return the (date, city) index, loading or building it on first use."""
+    global _log_index
+    if _log_index is None:
+        if STORAGE == "csv":
+            _log_index = LogIndex.load()
+        else:
+            # Partitions are small: the recent days come straight from them
+            _log_index = LogIndex()
+            for row in read_logs(start=LogIndex.cutoff(), columns=("Date", "City")):
+                _log_index.add(row["Date"], row["City"])
+    return _log_index
+
+
+def append_logs(rows):
+    """
+    Append [date, city, temperature, condition] rows to the log in one write
+    (per partition, when partitioned) and record them in the (date, city) index.
+    """
+    if not rows:
+        return
+    index = get_log_index()
+    if STORAGE == "columnar":
+        append_columnar(rows)
+    elif STORAGE == "monthly":
+        append_monthly(rows)
+    else:
+        end_last_line(FILENAME)
+        with open(FILENAME, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+    for row in rows:
+        index.add(row[0], row[1])
+    if STORAGE == "csv":
+        index.size = os.path.getsize(FILENAME)
+        index.save()
+
+
+class BufferedLogWriter:
+    """
+    Collects log rows in memory and appends them in batches, flushing once
+    'flush_rows' rows are waiting or 'flush_seconds' have passed since the
+    last flush. Safe to use from several threads. If a write fails the batch
+    is put back in front of newer rows and the error is raised, so the rows
+    go out with the next flush instead of being lost.
+    """
+
+    def __init__(self, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.rows = []
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.rows)
+
+    def add(self, row):
+        with self.lock:
+            self.rows.append(row)
+            full = len(self.rows) >= self.flush_rows
+        if full:
+            self.flush()
+
+    def flush_if_due(self):
+        """Flush when the oldest buffered row has waited 'flush_seconds'."""
+        if time.monotonic() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        # Writing happens under the lock so batches reach the log in order
+        with self.lock:
+            rows, self.rows = self.rows, []
+            self.last_flush = time.monotonic()
+            try:
+                append_logs(rows)
+            except Exception:
+                self.rows = rows + self.rows
+                raise
+
+
+class CollectorMetrics:
+    """Health figures of a running collector, shared between its threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.last_success = {}  # city -> time of the last successful fetch
+        self.last_error = {}    # city -> (time, message) of the last failure
+        self.last_write_error = None  # (time, message) of the last failed log write
+        self.fetched = 0
+        self.failed = 0
+        self.write_failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    def record(self, city, latency, error=None):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.latency_last = latency
+            if error is None:
+                self.fetched += 1
+                self.last_success[city] = now
+            else:
+                self.failed += 1
+                if not isinstance(error, WeatherError):
+                    error = f"{type(error).__name__}: {error}"
+                self.last_error[city] = [now, str(error)]
+
+    def record_write_error(self, error):
+        """Count a failed log write; its rows stay buffered for the next flush."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.write_failed += 1
+            self.last_write_error = [now, f"{type(error).__name__}: {error}"]
+
+    def snapshot(self, queue_depth=0, buffered_rows=0):
+        """Return the metrics as a JSON-compatible dict."""
+        with self.lock:
+            attempts = self.fetched + self.failed
+            return {
+                "started": self.started,
+                "fetched": self.fetched,
+                "failed": self.failed,
+                "write_failed": self.write_failed,
+                "queue_depth": queue_depth,
+                "buffered_rows": buffered_rows,
+                "latency_seconds": {
+                    "last": round(self.latency_last, 3),
+                    "mean": round(self.latency_total / attempts, 3) if attempts else 0.0,
+                    "max": round(self.latency_max, 3),
+                },
+                "last_success": dict(self.last_success),
+                "last_error": dict(self.last_error),
+                "last_write_error": self.last_write_error,
+            }
+
+
+class WeatherCollector:
+    """
+    Long-running collector that logs the weather for a fixed set of cities.
+
+    Every 'interval' seconds a scheduler walks the city list and spreads the
+    requests evenly over the interval instead of firing them in one burst.
+    Cities already logged today are skipped, so each city is logged once a
+    day and failed cities are retried on the next round. Worker threads fetch
+    over one pooled session and hand rows to a BufferedLogWriter. stop() (or
+    SIGINT/SIGTERM) ends the run after flushing every buffered row. Metrics
+    are written to 'metrics_file' and, if 'metrics_port' is set, served as
+    JSON over HTTP.
+    """
+
+    def __init__(self, cities, interval=COLLECT_INTERVAL, workers=MAX_WORKERS, api_url=API_URL,
+                 flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS,
+                 metrics_file=METRICS_FILE, metrics_port=None):
+        self.cities = list(dict.fromkeys(city.strip() for city in cities if city.strip()))
+        self.interval = interval
+        self.workers = workers
+        self.api_url = api_url
+        self.writer = BufferedLogWriter(flush_rows, flush_seconds)
+        self.metrics = CollectorMetrics()
+        self.metrics_file = metrics_file
+        self.metrics_port = metrics_port
+        self.queue = queue.Queue()
+        self.stopping = threading.Event()
+        self.logged = set()  # (date, folded city) fetched today, possibly still buffered
+        self.in_flight = set()  # folded cities queued or being fetched right now
+        self.logged_lock = threading.Lock()
+
+    def health(self):
+        """Return the current metrics snapshot."""
+        return self.metrics.snapshot(self.queue.qsize(), len(self.writer))
+
+    def write_metrics(self):
+        if not self.metrics_file:
+            return
+        tmp_file = self.metrics_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.health(), f, indent=2)
+        os.replace(tmp_file, self.metrics_file)
+
+    def stop(self, *_):
+        """Ask the collector to shut down; also used as a signal handler."""
+        self.stopping.set()
+
+    def _flush(self, force=True):
+        """Flush the writer, recording a failed write instead of raising."""
+        try:
+            if force:
+                self.writer.flush()
+            else:
+                self.writer.flush_if_due()
+        except Exception as e:
+            self.metrics.record_write_error(e)
+
+    def _worker(self, session, limiter):
+        while True:
+            city = self.queue.get()
+            if city is None:
+                return
+            try:
+                self._collect(city, session, limiter)
+            finally:
+                with self.logged_lock:
+                    self.in_flight.discard(city.casefold())
+
+    def _collect(self, city, session, limiter):
+        today = datetime.now().strftime("%Y-%m-%d")
+        started = time.monotonic()
+        try:
+            temp, condition = fetch_weather(city, session, limiter, self.api_url)
+        except Exception as e:
+            # Whatever went wrong is recorded and the worker carries on,
+            # so a surprise can't silently stop collection
+            self.metrics.record(city, time.monotonic() - started, e)
+            return
+        self.metrics.record(city, time.monotonic() - started)
+        with self.logged_lock:
+            self.logged.add((today, city.casefold()))
+        try:
+            self.writer.add([today, city, temp, condition])
+        except Exception as e:
+            # The row stays buffered, so this is a write failure, not a
+            # failed fetch, and the city isn't fetched again
+            self.metrics.record_write_error(e)
+
+    def _serve_metrics(self):
+        collector = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(collector.health()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # keep request logs out of the collector's output
+
+        server = ThreadingHTTPServer(("127.0.0.1", self.metrics_port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _wait(self, seconds):
+        """Sleep until 'seconds' from now, flushing and reporting on the way."""
+        deadline = time.monotonic() + seconds
+        while not self.stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self.stopping.wait(min(remaining, 1.0))
+            self._flush(force=False)
+
+    def run(self):
+        """Collect until stopped, then flush and shut the workers down."""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+        server = self._serve_metrics() if self.metrics_port else None
+        index = get_log_index()
+        limiter = RateLimiter()
+
+        with make_session(self.workers) as session:
+            threads = [threading.Thread(target=self._worker, args=(session, limiter))
+                       for _ in range(self.workers)]
+            for thread in threads:
+                thread.start()
+
+            print(f"Collecting weather for {len(self.cities)} cities every {self.interval:g}s. "
+                  "Press Ctrl+C to stop.")
+            while not self.stopping.is_set():
+                round_started = time.monotonic()
+                # Earlier days can't be queued again, so forget them
+                today = datetime.now().strftime("%Y-%m-%d")
+                with self.logged_lock:
+                    self.logged = {entry for entry in self.logged if entry[0] == today}
+                # Spread this round's requests evenly over the interval
+                spacing = self.interval / max(len(self.cities), 1)
+                for position, city in enumerate(self.cities):
+                    self._wait(round_started + position * spacing - time.monotonic())
+                    if self.stopping.is_set():
+                        break
+                    # A city still waiting or being fetched from an earlier
+                    # round isn't queued a second time
+                    today = datetime.now().strftime("%Y-%m-%d")
+                    with self.logged_lock:
+                        skip = ((today, city.casefold()) in self.logged
+                                or city.casefold() in self.in_flight)
+                        if not skip and not index.is_logged(today, city):
+                            self.in_flight.add(city.casefold())
+                            self.queue.put(city)
+                self.write_metrics()
+                self._wait(round_started + self.interval - time.monotonic())
+
+            # Graceful shutdown: drop unsent work, finish running fetches,
+            # then write out everything still buffered
+            while True:
+                try:
+                    city = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                with self.logged_lock:
+                    self.in_flight.discard(city.casefold())
+            for _ in threads:
+                self.queue.put(None)
+            for thread in threads:
+                thread.join()
+        self._flush()
+        if len(self.writer):
+            print(f"⚠️ {len(self.writer)} rows could not be written: "
+                  f"{self.metrics.last_write_error[1]}")
+        self.write_metrics()
+        if server is not None:
+            server.shutdown()
+        print("Collector stopped. 👋")
 
 
 def log_weather():
@@ -20,66 +1000,93 @@ def log_weather():
     and append the data to the CSV file if it hasn't already been logged today.
     """
     # Get today's date in YYYY-MM-DD format
-    date = datetime.now().strftime("%Y-%m-%d")
+    today = datetime.now().strftime("%Y-%m-%d")
     city = input("Enter your city name: ").strip()
 
     # Check if this city has already been logged today
-    with open(FILENAME, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row["Date"] == date and row["City"].lower() == city.lower():
-                print("This city has already been logged for today.")
-                return
+    if get_log_index().is_logged(today, city):
+        print("This city has already been logged for today.")
+        return
 
-    # Build the API URL with the city name, API key, and metric units
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
     try:
-        response = requests.get(url)
-        data = response.json()
-
-        # Handle non-200 HTTP status codes
-        if response.status_code != 200:
-            print(f"Error: {data.get('message', 'Unknown error')}")
-            return
-
-        # Extract temperature and weather condition from the JSON response
-        temp = data["main"]["temp"]
-        condition = data["weather"][0]["main"]
-
-        # Display the weather info to the user
-        print(f"🌤️ Temperature in {city} on {date}: {temp}°C — {condition} 🌈")
-        # Append the new log entry to the CSV file
-        with open(FILENAME, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([date, city, temp, condition])
+        temp, condition = fetch_weather(city, cache=default_cache)
+    except WeatherError as e:
+        print(e)
+        return
     except Exception as e:
-        # Catch any exceptions (network issues, parsing errors, etc.)
+        # Catch any other exceptions (parsing errors, etc.)
         print(f"Error fetching weather data: {e}")
         return
 
+    # Display the weather info to the user
+    print(f"🌤️ Temperature in {city} on {today}: {temp}°C — {condition} 🌈")
+    # Append the new log entry to the CSV file
+    append_logs([[today, city, temp, condition]])
+
+
+def log_weather_batch(cities, workers=MAX_WORKERS, api_url=API_URL, cache=None):
+    """
+    Log the weather for a list of cities in one go.
+    Cities already logged today (and repeats within the list) are skipped, the
+    rest are fetched concurrently and all new rows are appended in one write.
+    Returns the number of rows logged.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    index = get_log_index()
+    seen = set()
+    pending = []
+    for city in cities:
+        city = city.strip()
+        if city and not index.is_logged(today, city) and city.casefold() not in seen:
+            seen.add(city.casefold())
+            pending.append(city)
+
+    rows = []
+    cache = cache or default_cache
+    for city, result in fetch_many(pending, workers, api_url, cache=cache):
+        if isinstance(result, WeatherError):
+            print(f"{city}: {result}")
+            continue
+        temp, condition = result
+        rows.append([today, city, temp, condition])
+
+    append_logs(rows)
+    print(f"Logged {len(rows)} of {len(pending)} cities ({len(cities) - len(pending)} skipped).")
+    print("Cache: {hits} hits, {stale_hits} stale hits, {misses} misses".format(**cache.stats()))
+    return len(rows)
 
-def view_logs():
+
+def view_logs(start=None, end=None, city=None):
     """
-    Read and display all weather logs stored in the CSV file.
-    If the file doesn't exist or is empty (only header), inform the user.
+    Display the weather logs dated between 'start' and 'end' (inclusive,
+    'YYYY-MM-DD'), optionally for one city. With partitioned storage only the
+    months in that range are read.
+    If there are no matching logs, inform the user.
     """
-    if not os.path.exists(FILENAME):
+    found = False
+    for row in read_logs(start, end, city):
+        if not found:
+            # Print a simple table of logs
+            print("-" * 50)
+            found = True
+        print(f" {row['Date']} | {row['City']} | {row['Temperature']} | {row['Condition']} ")
+
+    if not found:
         print("No Weather Logs Found.")
         return
+    print("-" * 50)
 
-    with open(FILENAME, "r", encoding="utf-8") as f:
-        reader = list(csv.reader(f))
-
-        # Check if only the header row exists
-        if len(reader) <= 1:
-            print("No Weather Logs Found.")
-            return
 
-        # Print a simple table of logs
-        print("-" * 50)
-        for row in reader[1:]:
-            print(f" {row[0]} | {row[1]} | {row[2]} | {row[3]} ")
-        print("-" * 50)
+def ask_date(prompt):
+    """Ask for an optional YYYY-MM-DD date; returns None when left blank or invalid."""
+    value = input(prompt).strip()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        print("Invalid date, ignoring it.")
+        return None
 
 
 def main():
@@ -90,7 +1097,7 @@ def main():
     while True:
         print("Real Time Weather Logger 🌡️")
         print("1. Add Weather Log")
-        print("2. View All Weather Logs")
+        print("2. View Weather Logs")
         print("3. Exit")
 
         choice = input("Enter your choice (1-3): ").strip()
@@ -99,7 +1106,10 @@ def main():
             case "1":
                 log_weather()
             case "2":
-                view_logs()
+                start = ask_date("From date (YYYY-MM-DD, blank for all): ")
+                end = ask_date("To date (YYYY-MM-DD, blank for all): ")
+                city = input("City (blank for all): ").strip() or None
+                view_logs(start, end, city)
             case "3":
                 print("Exiting the program. Goodbye! 👋")
                 break
@@ -109,4 +1119,66 @@ def main():
 
 # Run the main function only when this script is executed directly
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Real Time Weather Logger")
+    parser.add_argument("--cities", help="comma-separated cities to log without the menu")
+    parser.add_argument("--city-file", help="file with one city per line to log without the menu")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="concurrent requests")
+    parser.add_argument("--api-url", default=API_URL, help="weather endpoint (e.g. a local stub)")
+    parser.add_argument("--cache-db", nargs="?", const=CACHE_DB,
+                        help=f"also cache responses in a SQLite file (default: {CACHE_DB})")
+    parser.add_argument("--ttl", type=float, default=CACHE_TTL, help="seconds a cached response is fresh")
+    parser.add_argument("--stale-ttl", type=float, default=CACHE_STALE_TTL,
+                        help="seconds a stale response is served while it refreshes")
+    parser.add_argument("--storage", choices=("csv", "monthly", "columnar"), default=STORAGE,
+                        help="log storage layout (default: WEATHER_STORAGE or csv)")
+    parser.add_argument("--migrate", action="store_true",
+                        help="copy weather.csv into the --storage layout and exit")
+    parser.add_argument("--view", action="store_true", help="print logs without the menu")
+    parser.add_argument("--days", type=int, help="with --view: only the last N days")
+    parser.add_argument("--start", help="with --view: first date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="with --view: last date (YYYY-MM-DD)")
+    parser.add_argument("--city", help="with --view: only this city")
+    parser.add_argument("--collect", action="store_true",
+                        help="keep logging --cities/--city-file on a schedule until stopped")
+    parser.add_argument("--interval", type=float, default=COLLECT_INTERVAL,
+                        help="with --collect: seconds between rounds")
+    parser.add_argument("--flush-rows", type=int, default=FLUSH_ROWS,
+                        help="with --collect: write after this many buffered rows")
+    parser.add_argument("--flush-seconds", type=float, default=FLUSH_SECONDS,
+                        help="with --collect: write buffered rows at least this often")
+    parser.add_argument("--metrics-file", default=METRICS_FILE,
+                        help="with --collect: file the health metrics are written to")
+    parser.add_argument("--metrics-port", type=int,
+                        help="with --collect: also serve the metrics as JSON on this local port")
+    args = parser.parse_args()
+
+    STORAGE = args.storage
+    if args.migrate:
+        migrate_logs(STORAGE)
+        raise SystemExit
+
+    tiers = [MemoryTier()]
+    if args.cache_db:
+        tiers.append(SQLiteTier(args.cache_db))
+    default_cache = WeatherCache(tiers, args.ttl, args.stale_ttl)
+
+    cities = args.cities.split(",") if args.cities else []
+    if args.city_file:
+        with open(args.city_file, "r", encoding="utf-8") as f:
+            cities += [line for line in f if line.strip()]
+
+    # Collector, batch and view modes run without the interactive menu
+    if args.collect:
+        if not cities:
+            parser.error("--collect needs --cities or --city-file")
+        WeatherCollector(cities, args.interval, args.workers, args.api_url, args.flush_rows,
+                         args.flush_seconds, args.metrics_file, args.metrics_port).run()
+    elif cities:
+        log_weather_batch(cities, args.workers, args.api_url)
+    if args.view:
+        start = args.start
+        if args.days:
+            start = (date.today() - timedelta(days=args.days - 1)).isoformat()
+        view_logs(start, args.end, args.city)
+    if not (cities or args.view):
+        main()
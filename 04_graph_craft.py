@@ -1,52 +1,743 @@
+import os                        # Check for files and partition directories
 import csv                       # Read CSV files
-from collections import defaultdict  # Auto-creates dictionary entries with default int(0)
-import matplotlib.pyplot as plt  # Plotting library
+import json                      # Read the columnar partition dictionaries
+import hashlib                   # Fingerprint the part of a log already aggregated
+import argparse                  # Command-line options
+import io                        # Re-read irregular CSV blocks with the csv module
+from datetime import date, timedelta
+from collections import Counter  # Condition frequencies
+import numpy as np               # Vectorized aggregation and downsampling (ships with matplotlib)
+from matplotlib.figure import Figure  # Figures drawn without a display...
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # ...by the Agg renderer
+
+# pandas is optional: when it's installed its C parser splits the CSV logs,
+# otherwise the csv module does; either way the columns are converted by numpy
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 # Name of the CSV file containing weather data
 FILENAME = "weather.csv"
+# Storage layout written by 03_temp_trail.py: "csv" (the single weather.csv),
+# "monthly" (one CSV per month) or "columnar" (binary column files per month)
+STORAGE = os.environ.get("WEATHER_STORAGE", "csv")
+# Directory holding the month partitions
+PARTITION_DIR = "weather_logs"
+COLUMNS = ("Date", "City", "Temperature", "Condition")
+# Array typecodes of the columnar format: day ordinal, city id, °C, condition id
+COLUMN_TYPES = {"Date": "i", "City": "I", "Temperature": "d", "Condition": "I"}
+# Size of the blocks a CSV log is read and converted in
+CHUNK_BYTES = 4 * 1024 * 1024
+# Points drawn per line; longer series are downsampled to this many
+TARGET_POINTS = 1000
+# Up to this many cities get their own line and band; more are combined into one
+MAX_CITY_LINES = 8
+# Chart written when no output file is given
+OUTPUT_FILE = "weather_chart.png"
+# Day ordinal of 1970-01-01, the zero of numpy's datetime64
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Aggregates of the CSV logs kept between runs, so only new rows are read
+STATE_FILE = "weather_chart.state.npz"
+STATE_VERSION = 1
+FINGERPRINT_BYTES = 4096  # Bytes hashed to detect edits to the part already aggregated
+# Bits of the packed (city, condition, day) keys: day ordinals up to 9999-12-31
+# need 22 bits, conditions get 16
+DAY_BITS = 22
+DAY_MASK = (1 << DAY_BITS) - 1
+CONDITION_BITS = 16
+CONDITION_MASK = (1 << CONDITION_BITS) - 1
+
+
+def partition_months(start=None, end=None):
+    """List the 'YYYY-MM' partitions that can hold rows between two dates."""
+    if not os.path.isdir(PARTITION_DIR):
+        return []
+    months = {name[:7] for name in os.listdir(PARTITION_DIR) if len(name) >= 7 and name[4] == "-"}
+    return sorted(month for month in months
+                  if (start is None or month >= start[:7]) and (end is None or month <= end[:7]))
+
+
+class WeatherData:
+    """Typed columns of the readings in a date range, ready for aggregation."""
+
+    def __init__(self, days, cities, temps, conditions, city_names, condition_names, rejected):
+        self.days = days              # Day ordinals (int32)
+        self.cities = cities          # Index into city_names for every reading
+        self.temps = temps            # °C (float64)
+        self.conditions = conditions  # Index into condition_names for every reading
+        self.city_names = city_names
+        self.condition_names = condition_names
+        self.rejected = rejected      # Counter of reason -> rows left out
+
+    def __len__(self):
+        return len(self.temps)
+
+
+class WeatherLoader:
+    """
+    Collects typed chunks of readings between 'start' and 'end' (optionally
+    for one city) and counts the rows it rejects, by reason. Cities and
+    conditions are stored as integer codes shared by all chunks; pass
+    'city_ids'/'condition_ids' to keep the codes of an earlier load.
+    """
+
+    def __init__(self, start=None, end=None, city=None, city_ids=None, condition_ids=None):
+        self.first = date.fromisoformat(start).toordinal() if start else None
+        self.last = date.fromisoformat(end).toordinal() if end else None
+        self.city = city.casefold() if city else None
+        self.city_ids = {} if city_ids is None else city_ids
+        self.condition_ids = {} if condition_ids is None else condition_ids
+        self.chunks = []  # (days, cities, temps, conditions) arrays
+        self.rejected = Counter()
+
+    def codes(self, ids, names):
+        """Map names to their integer codes, adding unseen names to 'ids'."""
+        for name in dict.fromkeys(names):  # distinct names in order of appearance
+            ids.setdefault(name, len(ids))
+        return np.fromiter(map(ids.__getitem__, names), dtype=np.uint32, count=len(names))
+
+    def reject(self, mask, reason):
+        """Count the rows selected by 'mask' as rejected for 'reason'."""
+        count = int(np.count_nonzero(mask))
+        if count:
+            self.rejected[reason] += count
+
+    def add(self, days, cities, temps, conditions):
+        """
+        Keep the rows of a typed chunk that fall inside the requested range.
+        'cities' and 'conditions' are codes from codes().
+        """
+        keep = np.ones(len(temps), dtype=bool)
+        if self.first is not None:
+            keep &= days >= self.first
+        if self.last is not None:
+            keep &= days <= self.last
+        if self.city is not None:
+            wanted = [i for name, i in self.city_ids.items() if name.casefold() == self.city]
+            keep &= np.isin(cities, wanted)
+        finite = np.isfinite(temps)
+        self.reject(keep & ~finite, "temperature not finite")
+        keep &= finite
+        if keep.any():
+            self.chunks.append((days[keep], cities[keep], temps[keep], conditions[keep]))
+
+    def add_text(self, dates, cities, temps, conditions):
+        """Parse and add a chunk of text columns (sequences of strings)."""
+        if not len(dates):
+            return
+        days, valid = parse_dates(dates, self.rejected)
+        # Rows with a bad date are already rejected; give each row one reason
+        values, parsed = parse_temperatures(temps, self.rejected, valid)
+        valid &= parsed
+        cities = self.codes(self.city_ids, cities)
+        conditions = self.codes(self.condition_ids, conditions)
+        if not valid.all():
+            days, cities, values, conditions = (column[valid] for column in
+                                                (days, cities, values, conditions))
+        self.add(days, cities, values, conditions)
+
+    def result(self):
+        """Join the chunks into a WeatherData."""
+        if self.chunks:
+            days, cities, temps, conditions = (np.concatenate(column) for column in zip(*self.chunks))
+        else:
+            days = np.empty(0, dtype=np.int32)
+            cities = conditions = np.empty(0, dtype=np.uint32)
+            temps = np.empty(0)
+        return WeatherData(days, cities, temps, conditions, list(self.city_ids),
+                           list(self.condition_ids), self.rejected)
+
+
+def parse_dates(texts, rejected):
+    """
+    Parse 'YYYY-MM-DD' strings into day ordinals. Returns (ordinals, valid
+    mask); the reasons for invalid entries are counted in 'rejected'.
+    """
+    bad = 0
+    try:
+        # numpy parses ISO dates in C; empty strings become NaT
+        parsed = np.array(texts, dtype="datetime64[D]")
+    except ValueError:
+        # At least one malformed date: parse one by one to find them
+        parsed = np.full(len(texts), np.datetime64("NaT"), dtype="datetime64[D]")
+        for i, text in enumerate(texts):
+            if text:
+                try:
+                    parsed[i] = date.fromisoformat(text)
+                except ValueError:
+                    bad += 1
+    valid = ~np.isnat(parsed)
+    missing = len(texts) - int(np.count_nonzero(valid)) - bad
+    if bad:
+        rejected["bad date"] += bad
+    if missing:
+        rejected["missing date"] += missing
+    days = np.where(valid, parsed.astype(np.int64) + EPOCH_ORDINAL, 0).astype(np.int32)
+    return days, valid
+
+
+def parse_temperatures(texts, rejected, counted=None):
+    """
+    Parse temperature strings into floats. Returns (values, valid mask);
+    the reasons for invalid entries are counted in 'rejected', but only for
+    the rows selected by the 'counted' mask when one is given (the others
+    were already rejected for another reason).
+    """
+    try:
+        values = np.array(texts, dtype=np.float64)
+        return values, np.ones(len(values), dtype=bool)
+    except ValueError:
+        pass
+    # At least one value isn't a number: convert each distinct text once
+    distinct = list(set(texts))
+    parsed = np.zeros(len(distinct))
+    valid = np.ones(len(distinct), dtype=bool)
+    for i, text in enumerate(distinct):
+        try:
+            parsed[i] = float(text)
+        except ValueError:
+            valid[i] = False
+    positions = {text: i for i, text in enumerate(distinct)}
+    codes = np.fromiter(map(positions.__getitem__, texts), dtype=np.int64, count=len(texts))
+    counts = np.bincount(codes if counted is None else codes[counted], minlength=len(distinct))
+    for i in np.flatnonzero(~valid):
+        rejected["bad temperature" if distinct[i].strip() else "missing temperature"] += int(counts[i])
+    return parsed[codes], valid[codes]
+
+
+def split_block(block, header, rejected):
+    """
+    Split a block of whole CSV lines (bytes) into the COLUMNS. Plain blocks
+    are split with str.split in one go; blocks with quoted fields or rows of
+    the wrong length go through the csv module instead.
+    """
+    positions = [header.index(name) for name in COLUMNS]
+    width = len(header)
+    block = block.decode("utf-8")
+    if '"' not in block:
+        # csv.writer ends lines with \r\n, other tools with \n
+        newline = "\r\n" if "\r\n" in block else "\n"
+        lines = block.split(newline)
+        # Every line must have exactly 'width' fields: a long row followed by
+        # a short one would keep the block's total but shift the columns.
+        # The last piece is the empty text after the final newline.
+        if not lines[-1] and {line.count(",") for line in lines[:-1]} == {width - 1}:
+            fields = block.replace(newline, ",").split(",")
+            return [fields[position:-1:width] for position in positions]
+
+    rows = [row for row in csv.reader(io.StringIO(block)) if row]
+    complete = [row for row in rows if len(row) == width]
+    if len(complete) < len(rows):
+        rejected["wrong number of fields"] += len(rows) - len(complete)
+    if not complete:
+        return [[] for _ in positions]
+    columns = list(zip(*complete))
+    return [columns[position] for position in positions]
+
+
+def split_block_pandas(block, header, rejected):
+    """
+    Split a block of whole CSV lines (bytes) into the COLUMNS with pandas' C
+    parser, counting rows with the wrong number of fields in 'rejected'.
+    """
+    # Every column is read: with usecols the C parser silently cuts long rows
+    # and pads short ones
+    options = dict(header=None, names=header, dtype=str, keep_default_na=False)
+    try:
+        frame = pd.read_csv(io.BytesIO(block), on_bad_lines="error", **options)
+    except pd.errors.ParserError:
+        # Rows with too many fields. Only the python engine hands them to a
+        # callable, so this (rare) block is parsed again with it to count them.
+        def count_bad_line(fields):
+            rejected["wrong number of fields"] += 1
+            return None  # drop the row
+
+        frame = pd.read_csv(io.BytesIO(block), engine="python", on_bad_lines=count_bad_line,
+                            **options)
+    # Rows with too few fields are padded with NaN instead of being reported
+    short = frame.isna().any(axis=1).to_numpy()
+    if short.any():
+        rejected["wrong number of fields"] += int(short.sum())
+        frame = frame[~short]
+    return [frame[name].to_numpy() for name in COLUMNS]
+
+
+def load_csv(path, loader, offset=0, pending=None):
+    """
+    Read a CSV log from byte 'offset' on, in blocks of about CHUNK_BYTES cut
+    at line ends. Returns the offset after the last terminated line.
+
+    A final line without a line break may still be being written (or, like
+    the end of the shipped weather.csv, just lack one). If it has every
+    field it goes to the 'pending' loader (by default 'loader') but stays
+    after the returned offset, so callers that save the offset read it again
+    once it has been terminated.
+    """
+    split = split_block_pandas if pd is not None else split_block
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if not header:
+            return offset
+        offset = max(offset, f.tell())
+        f.seek(offset)
+        while True:
+            block = f.read(CHUNK_BYTES)
+            if block and not block.endswith(b"\n"):
+                block += f.readline()  # finish the last line of the block
+            # Skip blank lines at the start, such as the line break added
+            # after a final line that was read without one
+            blank = len(block) - len(block.lstrip(b"\r\n"))
+            block = block[blank:]
+            offset += blank
+            complete = block.rfind(b"\n") + 1
+            if complete:
+                loader.add_text(*split(block[:complete], header, loader.rejected))
+                offset += complete
+            if complete < len(block) or not block:
+                if complete < len(block) and is_whole_row(block[complete:], header):
+                    target = loader if pending is None else pending
+                    target.add_text(*split(block[complete:] + b"\n", header, target.rejected))
+                return offset
+
+
+def is_whole_row(line, header):
+    """Return True if an unterminated last line (bytes) holds a complete row."""
+    try:
+        row = next(csv.reader([line.decode("utf-8")]), [])
+    except (UnicodeDecodeError, csv.Error):
+        return False  # cut inside a character or a quoted field
+    return len(row) == len(header)
+
+
+def load_columnar(month, loader):
+    """Add a columnar month partition; its columns are already typed."""
+    path = os.path.join(PARTITION_DIR, month)
+    data = {name: np.fromfile(os.path.join(path, f"{name}.bin"), dtype=np.dtype(COLUMN_TYPES[name]))
+            for name in COLUMNS}
+    count = min(len(values) for values in data.values())
+    # Rows whose columns were not all written (an interrupted append)
+    partial = max(len(values) for values in data.values()) - count
+    if partial:
+        loader.rejected["incomplete columnar row"] += partial
+
+    # Translate the partition's own city and condition ids to the loader's codes
+    with open(os.path.join(path, "City.json"), "r", encoding="utf-8") as f:
+        cities = loader.codes(loader.city_ids, json.load(f))
+    with open(os.path.join(path, "Condition.json"), "r", encoding="utf-8") as f:
+        conditions = loader.codes(loader.condition_ids, json.load(f))
+    loader.add(data["Date"][:count], cities[data["City"][:count]],
+               data["Temperature"][:count], conditions[data["Condition"][:count]])
+
+
+def load_weather(start=None, end=None, city=None, storage=None):
+    """
+    Load the readings between 'start' and 'end' ('YYYY-MM-DD', inclusive),
+    optionally for one city, into a WeatherData. CSV logs are read in chunks
+    and converted to typed arrays; with partitioned storage only the months
+    in the range are opened.
+    """
+    storage = storage or STORAGE
+    loader = WeatherLoader(start, end, city)
+    if storage == "csv":
+        if os.path.exists(FILENAME):
+            load_csv(FILENAME, loader)
+        return loader.result()
+    for month in partition_months(start, end):
+        if storage == "columnar":
+            if os.path.isdir(os.path.join(PARTITION_DIR, month)):
+                load_columnar(month, loader)
+        else:
+            path = os.path.join(PARTITION_DIR, f"{month}.csv")
+            if os.path.exists(path):
+                load_csv(path, loader)
+    return loader.result()
+
+
+def file_fingerprint(filename, size):
+    """
+    Fingerprint the first 'size' bytes of a file for fingerprint_matches():
+    a hash of the last FINGERPRINT_BYTES bytes before 'size' and the file's
+    modification time. (Kept identical in 00_contact_vault.py,
+    03_temp_trail.py and 04_graph_craft.py.)
+    """
+    with open(filename, "rb") as f:
+        start = max(0, size - FINGERPRINT_BYTES)
+        f.seek(start)
+        digest = hashlib.sha1(f.read(size - start)).hexdigest()
+        return [digest, os.fstat(f.fileno()).st_mtime_ns]
+
 
+def fingerprint_matches(filename, size, fingerprint):
+    """
+    Return True if the first 'size' bytes of a file are unchanged since
+    'fingerprint' was taken, so only the bytes after them need reading. A
+    file that grew only has the hashed tail compared (appending updates the
+    modification time); one of the same size must also keep its modification
+    time, which catches same-length edits away from the tail.
+    """
+    if not isinstance(fingerprint, list) or len(fingerprint) != 2:
+        return False  # missing, or saved by an older version
+    current_size = os.path.getsize(filename)
+    if size > current_size:
+        return False
+    with open(filename, "rb") as f:
+        if size == current_size and os.fstat(f.fileno()).st_mtime_ns != fingerprint[1]:
+            return False
+        start = max(0, size - FINGERPRINT_BYTES)
+        f.seek(start)
+        return hashlib.sha1(f.read(size - start)).hexdigest() == fingerprint[0]
 
-def visualize_weather():
-    # Lists to store dates and temperatures for the line chart
-    dates = []
-    temps = []
-    # Dictionary to count how many times each weather condition occurs
-    conditions = defaultdict(int)
-
-    # Open the CSV file safely with UTF-8 encoding
-    with open(FILENAME, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)  # Reads rows as dictionaries using header row
-
-        # Loop through each row in the CSV
-        for row in reader:
-            try:
-                # Collect date and temperature; convert temperature to float
-                dates.append(row["Date"])
-                temps.append(float(row["Temperature"]))
-                # Increment the count for this weather condition
-                conditions[row["Condition"]] += 1
-            except Exception as e:
-                # Skip rows with missing or invalid data
+
+class ChartState:
+    """
+    Aggregates of the CSV logs as of the last run, saved in STATE_FILE.
+    For every log the byte offset read up to and a fingerprint of the bytes
+    before it are kept, so the next run only reads the rows appended since.
+    When a log shrank, disappeared or its fingerprint no longer matches,
+    everything is aggregated again from scratch.
+    """
+
+    def __init__(self):
+        self.stats = DailyStats()
+        self.city_ids = {}       # city name -> code used in the keys
+        self.condition_ids = {}  # condition -> code used in the keys
+        self.files = {}          # path -> [offset read up to, fingerprint]
+        self.rejected = Counter()
+        self.pending = DailyStats()  # unterminated last lines, shown but not saved
+        self.pending_rejected = Counter()
+
+    def is_current(self, paths):
+        """Check that every aggregated log only grew since it was read."""
+        for path, (offset, fingerprint) in self.files.items():
+            if path not in paths or not os.path.exists(path):
+                return False
+            if not fingerprint_matches(path, offset, fingerprint):
+                return False
+        return True
+
+    def update(self, paths):
+        """
+        Fold the rows appended to 'paths' into the aggregates; returns the
+        rows read. Unterminated last lines are kept apart in 'pending' (and
+        'pending_rejected'), which are shown but never saved.
+        """
+        if not self.is_current(paths):
+            print("🔄 Weather logs changed, rebuilding chart state...")
+            self.__init__()
+        loader = WeatherLoader(city_ids=self.city_ids, condition_ids=self.condition_ids)
+        pending = WeatherLoader(city_ids=self.city_ids, condition_ids=self.condition_ids)
+        for path in paths:
+            offset = self.files.get(path, [0])[0]
+            if os.path.getsize(path) == offset:
                 continue
+            offset = load_csv(path, loader, offset, pending)
+            self.files[path] = [offset, file_fingerprint(path, offset)]
+        data = loader.result()
+        self.stats = self.stats.merge(DailyStats.from_readings(data))
+        self.rejected.update(data.rejected)
+        pending_data = pending.result()
+        self.pending = DailyStats.from_readings(pending_data)
+        self.pending_rejected = pending_data.rejected
+        return len(data) + sum(data.rejected.values()) + len(pending_data)
+
+    def save(self, path=STATE_FILE):
+        """Write the state atomically (temporary file, then rename)."""
+        meta = {"version": STATE_VERSION, "cities": list(self.city_ids),
+                "conditions": list(self.condition_ids), "files": self.files,
+                "rejected": dict(self.rejected)}
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), keys=self.stats.keys,
+                     counts=self.stats.counts, sums=self.stats.sums, mins=self.stats.mins,
+                     maxs=self.stats.maxs, condition_keys=self.stats.condition_keys,
+                     condition_counts=self.stats.condition_counts)
+        os.replace(tmp_file, path)
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        """Read a saved state; an empty one if there is none or it can't be used."""
+        state = cls()
+        if not os.path.exists(path):
+            return state
+        try:
+            with np.load(path, allow_pickle=False) as saved:
+                meta = json.loads(str(saved["meta"]))
+                if meta.get("version") != STATE_VERSION:
+                    return state
+                state.stats = DailyStats(saved["keys"], saved["counts"], saved["sums"],
+                                         saved["mins"], saved["maxs"], saved["condition_keys"],
+                                         saved["condition_counts"])
+        except (OSError, ValueError, KeyError):
+            print("⚠️ Chart state is unreadable, rebuilding it.")
+            return cls()
+        state.city_ids = {name: i for i, name in enumerate(meta["cities"])}
+        state.condition_ids = {name: i for i, name in enumerate(meta["conditions"])}
+        state.files = meta["files"]
+        state.rejected = Counter(meta["rejected"])
+        return state
+
+
+def sorted_runs(keys):
+    """Return the order that sorts 'keys' and where each run of equal keys starts in it."""
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    return order, np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
+class DailyStats:
+    """
+    Temperature statistics per (city, day) — readings, sum, min and max —
+    and reading counts per (city, day, condition). Keys pack the codes into
+    one int64 (city above the day ordinal, condition in between) so grouping
+    and merging are a single sort. Kept sorted by key, i.e. by city, then day.
+    """
+
+    def __init__(self, keys=None, counts=None, sums=None, mins=None, maxs=None,
+                 condition_keys=None, condition_counts=None):
+        empty = np.empty(0, dtype=np.int64)
+        self.keys = empty if keys is None else keys
+        self.counts = empty if counts is None else counts
+        self.sums = np.empty(0) if sums is None else sums
+        self.mins = np.empty(0) if mins is None else mins
+        self.maxs = np.empty(0) if maxs is None else maxs
+        self.condition_keys = empty if condition_keys is None else condition_keys
+        self.condition_counts = empty if condition_counts is None else condition_counts
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    @property
+    def cities(self):
+        return self.keys >> DAY_BITS
+
+    @property
+    def days(self):
+        return self.keys & DAY_MASK
+
+    @classmethod
+    def from_readings(cls, data):
+        """Aggregate the readings of a WeatherData."""
+        keys = (data.cities.astype(np.int64) << DAY_BITS) | data.days
+        condition_keys = (((data.cities.astype(np.int64) << CONDITION_BITS) | data.conditions)
+                          << DAY_BITS) | data.days
+        ones = np.ones(len(keys), dtype=np.int64)
+        return cls.combine(keys, ones, data.temps, data.temps, data.temps, condition_keys, ones)
+
+    @classmethod
+    def combine(cls, keys, counts, sums, mins, maxs, condition_keys, condition_counts):
+        """Group rows that share a key, adding counts and sums and keeping the extremes."""
+        if not len(keys):
+            return cls()
+        order, starts = sorted_runs(keys)
+        grouped = [keys[order][starts], np.add.reduceat(counts[order], starts),
+                   np.add.reduceat(sums[order], starts), np.minimum.reduceat(mins[order], starts),
+                   np.maximum.reduceat(maxs[order], starts)]
+        order, starts = sorted_runs(condition_keys)
+        return cls(*grouped, condition_keys[order][starts],
+                   np.add.reduceat(condition_counts[order], starts))
+
+    def merge(self, other):
+        """Return the statistics of both sets of readings together."""
+        if not len(other.keys):
+            return self
+        columns = ("keys", "counts", "sums", "mins", "maxs", "condition_keys", "condition_counts")
+        return DailyStats.combine(*(np.concatenate((getattr(self, name), getattr(other, name)))
+                                    for name in columns))
+
+    def select(self, first=None, last=None, cities=None):
+        """Keep the days between two ordinals (inclusive), optionally only some city codes."""
+        def keep(keys, city_shift):
+            days = keys & DAY_MASK
+            mask = np.ones(len(keys), dtype=bool)
+            if first is not None:
+                mask &= days >= first
+            if last is not None:
+                mask &= days <= last
+            if cities is not None:
+                mask &= np.isin(keys >> city_shift, cities)
+            return mask
+
+        daily = keep(self.keys, DAY_BITS)
+        conditions = keep(self.condition_keys, DAY_BITS + CONDITION_BITS)
+        return DailyStats(self.keys[daily], self.counts[daily], self.sums[daily], self.mins[daily],
+                          self.maxs[daily], self.condition_keys[conditions],
+                          self.condition_counts[conditions])
 
-    # Create and display a line chart of daily temperatures
-    plt.figure(figsize=(10, 7))          # Set figure size (width, height) in inches
-    plt.plot(dates, temps, marker="o")  # Plot temperature vs date with circle markers
-    plt.title("Daily Temperature Trends")  # Chart title
-    plt.xlabel("Date")                   # X-axis label
-    plt.ylabel("Temperature (°C)")       # Y-axis label
-    plt.tight_layout()                   # Adjust spacing to prevent label overlap
-    plt.grid(True)                       # Enable grid lines for easier reading
-    plt.show()                           # Display the chart
+    def series(self, combine=False):
+        """
+        Yield (city code, days, mins, means, maxs) per city, sorted by day.
+        With 'combine' all cities are merged into one series (city code None).
+        """
+        if combine:
+            days = self.days
+            merged = DailyStats.combine(days, self.counts, self.sums, self.mins, self.maxs,
+                                        days, self.counts)
+            yield None, merged.keys, merged.mins, merged.sums / merged.counts, merged.maxs
+            return
+        cities = self.cities
+        bounds = np.r_[np.flatnonzero(np.r_[True, cities[1:] != cities[:-1]]), len(cities)]
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            yield (int(cities[lo]), self.keys[lo:hi] & DAY_MASK, self.mins[lo:hi],
+                   self.sums[lo:hi] / self.counts[lo:hi], self.maxs[lo:hi])
 
-    # Create and display a bar chart of weather condition frequencies
-    plt.figure(figsize=(7, 5))
-    plt.bar(conditions.keys(), conditions.values(), color="skyblue")
-    plt.xlabel("Weather Condition")
-    plt.ylabel("Frequency")
-    plt.show()
+    def condition_totals(self):
+        """Return the number of readings of every condition code."""
+        codes = (self.condition_keys >> DAY_BITS) & CONDITION_MASK
+        return np.bincount(codes, weights=self.condition_counts).astype(np.int64)
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: return the indices of
+    'threshold' points of the line (x, y) that best keep its visual shape.
+    The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The third corner is the average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            next_x = x[hi:edges[i + 2]].mean()
+            next_y = y[hi:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Keep the point spanning the largest triangle with its neighbours
+        areas = np.abs((x[previous] - next_x) * (y[lo:hi] - y[previous])
+                       - (x[previous] - x[lo:hi]) * (next_y - y[previous]))
+        previous = lo + int(areas.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample(days, mins, means, maxs, points=TARGET_POINTS):
+    """
+    Reduce a daily series to about 'points' points. The mean line is
+    downsampled with LTTB; the band keeps the lowest minimum and highest
+    maximum between two kept points so no extreme is lost.
+    """
+    keep = lttb(days, means, points)
+    return (days[keep], np.minimum.reduceat(mins, keep), means[keep],
+            np.maximum.reduceat(maxs, keep))
+
+
+def to_datetimes(ordinals):
+    """Turn day ordinals into datetime64 values matplotlib places on a date axis."""
+    return (np.asarray(ordinals, dtype=np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def draw_charts(fig, stats, city_names, condition_names, points=TARGET_POINTS):
+    """Draw the temperature bands and the condition frequencies onto 'fig'."""
+    temp_ax, condition_ax = fig.subplots(2, 1, gridspec_kw={"height_ratios": [3, 2]})
+
+    # One band per city while that stays readable, otherwise all cities together
+    city_count = len(np.unique(stats.cities))
+    combine = city_count > MAX_CITY_LINES
+    for city_id, *daily in stats.series(combine):
+        label = f"All {city_count} cities" if combine else city_names[city_id]
+        days, mins, means, maxs = downsample(*daily, points=points)
+        x = to_datetimes(days)
+        line, = temp_ax.plot(x, means, linewidth=1, label=label)
+        temp_ax.fill_between(x, mins, maxs, color=line.get_color(), alpha=0.2, linewidth=0)
+    temp_ax.set_title("Daily Temperature Trends (mean with min–max band)")
+    temp_ax.set_xlabel("Date")
+    temp_ax.set_ylabel("Temperature (°C)")
+    temp_ax.grid(True)
+    temp_ax.legend(loc="upper left", fontsize="small")
+    temp_ax.tick_params(axis="x", labelrotation=30)
+
+    # Bar chart of weather condition frequencies, most common first
+    totals = stats.condition_totals()
+    order = [code for code in np.argsort(-totals, kind="stable") if totals[code]]
+    condition_ax.bar([condition_names[code] for code in order], totals[order], color="skyblue")
+    condition_ax.set_xlabel("Weather Condition")
+    condition_ax.set_ylabel("Frequency")
+
+
+def visualize_weather(start=None, end=None, city=None, output=OUTPUT_FILE, points=TARGET_POINTS,
+                      state_file=STATE_FILE):
+    """
+    Chart the daily temperature range and the condition counts of the logs
+    between 'start' and 'end' (inclusive), optionally for a single city.
+    The chart is rendered with Agg, so no display is needed, and written to
+    'output' in the format of its extension (.png, .svg, ...).
+
+    CSV logs are aggregated incrementally: the aggregates are kept in
+    'state_file' and each run only reads the rows appended since the last
+    one. Columnar partitions are typed already and are read directly.
+    """
+    if STORAGE == "columnar":
+        data = load_weather(start, end, city)
+        stats = DailyStats.from_readings(data)
+        city_names, condition_names, rejected = data.city_names, data.condition_names, data.rejected
+    else:
+        state = ChartState.load(state_file)
+        if STORAGE == "csv":
+            paths = [FILENAME] if os.path.exists(FILENAME) else []
+        else:
+            paths = [os.path.join(PARTITION_DIR, f"{month}.csv") for month in partition_months()]
+            paths = [path for path in paths if os.path.exists(path)]
+        read = state.update(paths)
+        state.save(state_file)
+        print(f"🔁 Read {read:,} new rows")
+
+        cities = None
+        if city:
+            cities = [i for name, i in state.city_ids.items() if name.casefold() == city.casefold()]
+        stats = state.stats.merge(state.pending)
+        stats = stats.select(date.fromisoformat(start).toordinal() if start else None,
+                             date.fromisoformat(end).toordinal() if end else None, cities)
+        city_names, condition_names = list(state.city_ids), list(state.condition_ids)
+        rejected = state.rejected + state.pending_rejected
+
+    if not len(stats):
+        print("No weather data to chart.")
+        return
+
+    fig = Figure(figsize=(10, 10))
+    FigureCanvasAgg(fig)
+    draw_charts(fig, stats, city_names, condition_names, points)
+    fig.tight_layout()
+    fig.savefig(output, dpi=100)
+    print(f"📈 Charted {len(stats):,} readings → {output}")
+    if rejected:
+        reasons = ", ".join(f"{reason}: {count:,}" for reason, count in rejected.most_common())
+        print(f"⚠️ Rejected {sum(rejected.values()):,} rows ({reasons})")
 
 
 # Run the visualization only when this script is executed directly
 if __name__ == "__main__":
-    visualize_weather()
+    parser = argparse.ArgumentParser(description="Weather charts")
+    parser.add_argument("--storage", choices=("csv", "monthly", "columnar"), default=STORAGE,
+                        help="log storage layout (default: WEATHER_STORAGE or csv)")
+    parser.add_argument("--days", type=int, help="only chart the last N days")
+    parser.add_argument("--start", help="first date to chart (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last date to chart (YYYY-MM-DD)")
+    parser.add_argument("--city", help="only chart this city")
+    parser.add_argument("--output", default=OUTPUT_FILE,
+                        help=f"chart file, .png or .svg (default: {OUTPUT_FILE})")
+    parser.add_argument("--points", type=int, default=TARGET_POINTS,
+                        help="points drawn per line after downsampling")
+    parser.add_argument("--state", default=STATE_FILE,
+                        help=f"file the CSV aggregates are kept in between runs (default: {STATE_FILE})")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="discard the saved aggregates and re-read the whole history")
+    args = parser.parse_args()
+
+    STORAGE = args.storage
+    start = args.start
+    if args.days:
+        start = (date.today() - timedelta(days=args.days - 1)).isoformat()
+    if args.rebuild and os.path.exists(args.state):
+        os.remove(args.state)
+    visualize_weather(start, args.end, args.city, args.output, args.points, args.state)
@@ -1,10 +1,32 @@
 import os          # Provides functions for interacting with the operating system (e.g., checking file existence)
 import json        # Handles JSON encoding and decoding
 import csv         # Handles CSV file reading and writing
+import re          # Skips whitespace between the elements of a streamed JSON array
+import pickle      # Compact spill format for the two-pass schema scan
+import shutil      # Concatenates the part files of a parallel conversion
+import tempfile    # Spill file of the two-pass schema scan, part files of parallel runs
+import argparse    # Command-line options for the streaming converter
+from concurrent.futures import ProcessPoolExecutor  # Worker processes for --jobs
+from itertools import chain, islice, repeat  # Replay the schema sample before the rest of the stream
 
 # --- Configuration Constants ---
 INPUT_FILE = "api_data.json"      # Path to the source JSON file
 OUTPUT_FILE = "converted_data.csv"  # Path where the resulting CSV will be saved
+READ_SIZE = 1024 * 1024           # Characters read at a time when streaming a JSON array
+WRITE_BUFFER = 1024 * 1024        # Bytes buffered before the CSV output is written to disk
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")  # Files always read as one JSON value per line
+SAMPLE_SIZE = 1000                # Records scanned for the columns in "sample" schema mode
+SPILL_BATCH = 1000                # Records pickled together in the "full" schema mode spill file
+SIGNATURE_LIMIT = 10000           # Distinct record layouts remembered while inferring the schema
+PARALLEL_CHUNK_BYTES = 32 * 1024 * 1024  # Size of the JSON Lines byte ranges handed to each worker
+# JSON type reported for each Python type a decoded value can have
+TYPE_NAMES = {int: "integer", float: "number", bool: "boolean", str: "string",
+              dict: "object", list: "array", type(None): "null"}
+
+# Shared decoder and whitespace matcher for the incremental parser
+decoder = json.JSONDecoder()
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_ENDS = (",", "]", " ", "\t", "\r", "\n")
 
 
 def load_json_data(filename):
@@ -32,17 +54,23 @@ def save_csv_data(data, filename):
     """
     Save a list of dictionaries to a CSV file.
 
-    Each dictionary in the list becomes a row; keys become column headers.
+    Each dictionary in the list becomes a row; the keys of all records, in
+    the order they first appear, become column headers.
     """
     # Guard clause: do nothing if there's no data
     if not data:
         print("No data to save.")
         return
 
+    # Collect the union of the keys so records with extra keys still fit
+    schema = Schema()
+    for record in data:
+        schema.add(record)
+
     # Open the output CSV file for writing
     with open(filename, "w", newline="", encoding="utf-8") as f:
-        # Create a CSV writer that uses dictionary keys as fieldnames
-        writer = csv.DictWriter(f, fieldnames=data[0].keys())
+        # Create a CSV writer that uses the collected keys as fieldnames
+        writer = csv.DictWriter(f, fieldnames=schema.fieldnames)
         writer.writeheader()  # Write the column headers
 
         # Iterate over each dictionary (row) and write it to the CSV
@@ -52,20 +80,552 @@ def save_csv_data(data, filename):
         print(f"Data successfully saved to {filename}")
 
 
-def main():
+def iter_json_array(f, read_size=READ_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The file is read in pieces of 'read_size' characters and each element is
+    decoded with JSONDecoder.raw_decode as soon as it is complete, so only
+    the current element (plus one read buffer) is held in memory.
+    Raises json.JSONDecodeError on malformed input.
+    """
+    buffer, pos, eof = "", 0, False
+    # Skip leading whitespace, however many pieces it spans
+    while not eof and WHITESPACE.match(buffer, pos).end() == len(buffer):
+        buffer, pos, eof = refill(f, buffer, len(buffer), read_size)
+    pos = WHITESPACE.match(buffer, pos).end()
+    if buffer[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Expected a top-level JSON array", buffer, pos)
+    pos += 1
+    expect_value = True  # Right after '[' or ','
+    empty = True         # No element seen yet, so ']' may follow '[' directly
+
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        # Keep at least one character ahead (more for a partial element)
+        if pos >= len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+            buffer, pos, eof = refill(f, buffer, pos, read_size)
+            continue
+
+        char = buffer[pos]
+        if char == "]" and (not expect_value or empty):
+            return
+        if not expect_value:
+            if char != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos)
+            pos += 1
+            expect_value = True
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            # Objects, arrays and strings end with their closing character; a
+            # number is only whole once a delimiter follows it ("3." may be "3.5")
+            complete = eof or buffer[end - 1] in '}]"' or buffer[end:end + 1] in NUMBER_ENDS
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # Read more; grow the request so one huge element isn't re-parsed
+            # once per READ_SIZE piece
+            buffer, pos, eof = refill(f, buffer, pos, max(read_size, len(buffer) - pos))
+            continue
+        yield value
+        pos = end
+        expect_value = empty = False
+
+
+def refill(f, buffer, pos, read_size):
+    """Drop the consumed part of the buffer and append the next piece of the file."""
+    more = f.read(read_size)
+    return buffer[pos:] + more, 0, not more
+
+
+def iter_json_lines(f):
+    """Yield the value on every non-blank line of a JSON Lines file."""
+    for number, line in enumerate(f, 1):
+        try:
+            # raw_decode skips json.loads' whitespace handling, which only
+            # matters for the rare padded or blank line
+            value, end = decoder.raw_decode(line)
+            if end < len(line) and line[end:].strip():
+                raise json.JSONDecodeError("Extra data", line, end)
+        except json.JSONDecodeError as e:
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError:
+                raise json.JSONDecodeError(f"Line {number}: {e.msg}", e.doc, e.pos) from None
+        yield value
+
+
+def detect_format(f, filename):
+    """
+    Guess whether a file holds a JSON array ("array"), JSON Lines ("jsonl")
+    or a single JSON document ("json") from its extension and first line.
+    The file position is restored afterwards.
+    """
+    if filename.lower().endswith(JSON_LINES_EXTENSIONS):
+        return "jsonl"
+    start = f.tell()
+    # An array is recognised from its first character, without reading what
+    # may be one enormous line
+    if f.read(READ_SIZE).lstrip().startswith("["):
+        f.seek(start)
+        return "array"
+    f.seek(start)
+    first_line = ""
+    for line in f:
+        if line.strip():
+            first_line = line.strip()
+            break
+    f.seek(start)
+    try:
+        json.loads(first_line)
+        return "jsonl"  # The first line is a whole value on its own
+    except json.JSONDecodeError:
+        return "json"   # A single document spread over several lines
+
+
+def iter_records(filename, fmt="auto"):
+    """
+    Yield the records of a JSON array, JSON Lines file or single JSON
+    document without loading the whole file (except for the last case,
+    which is one record anyway).
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        if fmt == "auto":
+            fmt = detect_format(f, filename)
+        if fmt == "array":
+            yield from iter_json_array(f)
+        elif fmt == "jsonl":
+            yield from iter_json_lines(f)
+        else:
+            data = json.load(f)
+            yield from (data if isinstance(data, list) else [data])
+
+
+class Schema:
+    """
+    Union of the keys of a set of records, in the order they were first
+    seen, with the JSON types found under each key.
+    """
+
+    def __init__(self):
+        self.columns = {}        # key -> set of Python types of its values
+        self.signatures = set()  # (keys, value types) of records already folded in
+        self.records = 0
+
+    def add(self, record):
+        """Fold one record (a dict) into the schema."""
+        self.records += 1
+        # Most records repeat the keys and types of earlier ones; those are
+        # recognised from one tuple lookup instead of a loop over the fields
+        signature = (tuple(record), tuple(map(type, record.values())))
+        if signature in self.signatures:
+            return
+        if len(self.signatures) >= SIGNATURE_LIMIT:
+            self.signatures.clear()  # Very irregular records: keep memory bounded
+        self.signatures.add(signature)
+        columns = self.columns
+        for key, value_type in zip(*signature):
+            types = columns.get(key)
+            if types is None:
+                types = columns[key] = set()
+            types.add(value_type)
+
+    def merge(self, columns, records):
+        """Fold in the columns and record count of another Schema, after this one's columns."""
+        for key, types in columns.items():
+            self.columns.setdefault(key, set()).update(types)
+        self.records += records
+
+    @property
+    def fieldnames(self):
+        return list(self.columns)
+
+    def column_type(self, key):
+        """
+        Return the JSON type of a column: "integer", "number", "boolean",
+        "string", "object", "array" or "null". Integers mixed with floats
+        are numbers; any other mix is reported as a string.
+        """
+        types = {TYPE_NAMES.get(t, "string") for t in self.columns[key]} - {"null"}
+        if not types:
+            return "null"
+        if types == {"integer", "number"}:
+            return "number"
+        return types.pop() if len(types) == 1 else "string"
+
+    def describe(self):
+        """Return the columns as a list of {"name", "type", "nullable"} dicts."""
+        return [{"name": key, "type": self.column_type(key), "nullable": type(None) in types}
+                for key, types in self.columns.items()]
+
+
+def save_schema(schema, filename):
+    """Write the inferred columns and their types to a JSON file."""
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"records": schema.records, "columns": schema.describe()}, f, indent=2)
+
+
+def print_schema(schema):
+    """Print every column with its inferred type."""
+    print(f"Schema of {schema.records} records:")
+    for column in schema.describe():
+        nullable = " (nullable)" if column["nullable"] else ""
+        print(f"  {column['name']}: {column['type']}{nullable}")
+
+
+def spill_records(records, schema, spill):
+    """
+    First pass of the full schema scan: add every record to 'schema' and
+    pickle it to the temporary file 'spill', so the second pass reads the
+    spill back instead of parsing the original JSON again. Records are
+    pickled SPILL_BATCH at a time, which makes reading them back cheap.
+    """
+    batch = []
+    for record in records:
+        schema.add(record)
+        batch.append(record)
+        if len(batch) == SPILL_BATCH:
+            pickle.dump(batch, spill, pickle.HIGHEST_PROTOCOL)
+            batch = []
+    if batch:
+        pickle.dump(batch, spill, pickle.HIGHEST_PROTOCOL)
+
+
+def iter_spill(spill):
+    """Second pass of the full schema scan: yield the records back from 'spill'."""
+    spill.seek(0)
+    while True:
+        try:
+            yield from pickle.load(spill)
+        except EOFError:
+            return
+
+
+def write_rows(records, writer, fieldnames, late_keys):
+    """
+    Write the records as CSV rows in 'fieldnames' order and return how many
+    were written. Keys outside 'fieldnames' are counted in 'late_keys'.
+    """
+    known = set(fieldnames)
+    written = 0
+    for record in records:
+        if not known.issuperset(record):
+            for key in record.keys() - known:
+                late_keys[key] = late_keys.get(key, 0) + 1
+        # Missing keys (and nulls) become empty cells, like DictWriter
+        writer.writerow(list(map(record.get, fieldnames)))
+        written += 1
+    return written
+
+
+def print_summary(output_file, written, skipped, late_keys, sample_size):
+    """Report the outcome of a conversion."""
+    if skipped:
+        print(f"Skipped {skipped} records that are not JSON objects.")
+    if late_keys:
+        keys = ", ".join(f"{key} ({count} records)" for key, count in late_keys.items())
+        print(f"Columns missing from the {sample_size}-record sample were left out: {keys}. "
+              "Use --schema full to include them.")
+    print(f"Data successfully saved to {output_file} ({written} rows)")
+
+
+def stream_json_to_csv(input_file, output_file, fmt="auto", schema_mode="sample",
+                       sample_size=SAMPLE_SIZE, schema_file=None, show_schema=False):
+    """
+    Convert a JSON array or JSON Lines file to CSV one record at a time.
+
+    The columns are the union of the keys of the records, in the order they
+    first appear. With schema_mode "sample" they are taken from the first
+    'sample_size' records (held in memory meanwhile); keys that only show up
+    later are left out and reported. With "full" every record is scanned
+    first and spilled to a temporary file, which the second pass reads
+    instead of parsing the JSON again. Records that aren't JSON objects are
+    skipped.
+
+    Output goes through a large write buffer into a temporary file that
+    replaces 'output_file' only once the whole input was converted, so a
+    malformed input never leaves a half-written CSV. Returns the number of
+    rows written, or None if the input was unusable.
+    """
+    if not os.path.exists(input_file):
+        print("No Json file found.")
+        return None
+
+    skipped = 0
+
+    def json_objects():
+        nonlocal skipped
+        for record in iter_records(input_file, fmt):
+            if isinstance(record, dict):
+                yield record
+            else:
+                skipped += 1
+
+    tmp_file = output_file + ".tmp"
+    written = 0
+    late_keys = {}  # keys outside the sampled schema -> records they were dropped from
+    schema = Schema()
+    try:
+        with tempfile.TemporaryFile() as spill:
+            records = json_objects()
+            if schema_mode == "full":
+                spill_records(records, schema, spill)
+                records = iter_spill(spill)
+            else:
+                sample = list(islice(records, sample_size))
+                for record in sample:
+                    schema.add(record)
+                records = chain(sample, records)
+
+            with open(tmp_file, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+                writer = csv.writer(f)
+                writer.writerow(schema.fieldnames)
+                written = write_rows(records, writer, schema.fieldnames, late_keys)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        print(f"Invalid JSON format: {e}")
+        return None
+
+    if not written:
+        os.remove(tmp_file)
+        print("No data to convert.")
+        return 0
+    os.replace(tmp_file, output_file)
+    if show_schema:
+        print_schema(schema)
+    if schema_file:
+        save_schema(schema, schema_file)
+    print_summary(output_file, written, skipped, late_keys, sample_size)
+    return written
+
+
+def list_inputs(path):
+    """Return the JSON files to convert: 'path' itself, or the JSON files in a directory by name."""
+    if not os.path.isdir(path):
+        return [path]
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.lower().endswith((".json",) + JSON_LINES_EXTENSIONS)]
+
+
+def plan_chunks(paths, fmt="auto", chunk_bytes=PARALLEL_CHUNK_BYTES):
+    """
+    Split the inputs into work items (path, format, start, end), in input
+    order. JSON Lines files are cut into byte ranges of about 'chunk_bytes'
+    that end at line breaks; other files can't be split and are one item.
+    """
+    chunks = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            file_fmt = detect_format(f, path) if fmt == "auto" else fmt
+        if file_fmt != "jsonl":
+            chunks.append((path, file_fmt, 0, None))
+            continue
+        size = os.path.getsize(path)
+        start = 0
+        with open(path, "rb") as f:
+            while start < size:
+                f.seek(start + chunk_bytes)
+                f.readline()  # move the cut to the end of the line it falls in
+                end = min(f.tell(), size)
+                chunks.append((path, file_fmt, start, end))
+                start = end
+    return chunks
+
+
+def iter_range_lines(path, start, end):
+    """Yield the decoded lines of a file between two byte offsets on line boundaries."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        for line in f:
+            if position >= end:
+                return
+            position += len(line)
+            yield line.decode("utf-8")
+
+
+def iter_chunk_records(chunk):
+    """Yield the records of one work item from plan_chunks()."""
+    path, fmt, start, end = chunk
+    if end is None:
+        yield from iter_records(path, fmt)
+    else:
+        yield from iter_json_lines(iter_range_lines(path, start, end))
+
+
+def scan_chunk(chunk):
+    """
+    Worker of the full schema scan: return (columns, records, error) for one
+    work item, where 'columns' maps every key to the types seen under it.
+    """
+    schema = Schema()
+    try:
+        for record in iter_chunk_records(chunk):
+            if isinstance(record, dict):
+                schema.add(record)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return None, 0, chunk_error(chunk, e)
+    return schema.columns, schema.records, None
+
+
+def convert_chunk(chunk, fieldnames, part_file):
+    """
+    Worker of the parallel conversion: write the rows of one work item,
+    without a header, to 'part_file'. Returns (written, skipped, late_keys,
+    error).
+    """
+    written = skipped = 0
+    late_keys = {}
+
+    def json_objects():
+        nonlocal skipped
+        for record in iter_chunk_records(chunk):
+            if isinstance(record, dict):
+                yield record
+            else:
+                skipped += 1
+
+    try:
+        with open(part_file, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            written = write_rows(json_objects(), csv.writer(f), fieldnames, late_keys)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return 0, 0, {}, chunk_error(chunk, e)
+    return written, skipped, late_keys, None
+
+
+def chunk_error(chunk, error):
+    """Describe a decoding error together with the file (and byte range) it happened in."""
+    path, _, start, end = chunk
+    where = path if end is None else f"{path} (bytes {start}-{end})"
+    return f"{where}: {error}"
+
+
+def convert_parallel(input_path, output_file, fmt="auto", schema_mode="sample",
+                     sample_size=SAMPLE_SIZE, jobs=os.cpu_count(), schema_file=None,
+                     show_schema=False):
+    """
+    Convert a JSON file or a directory of JSON files to one CSV with a pool
+    of 'jobs' worker processes.
+
+    JSON Lines inputs are split into byte ranges at line breaks, other files
+    are converted whole. Each work item is written to its own part file and
+    the parts are concatenated in input order under a single header, so the
+    output is the same as a sequential conversion, whatever the number of
+    workers. In "full" schema mode the schema scan runs in the pool as a
+    first pass (the records aren't spilled, each worker parses its range
+    twice instead).
+    """
+    paths = list_inputs(input_path)
+    if not paths or not all(os.path.exists(path) for path in paths):
+        print("No Json file found.")
+        return None
+    try:
+        chunks = plan_chunks(paths, fmt)
+    except UnicodeDecodeError as e:
+        print(f"Invalid JSON format: {e}")
+        return None
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Pass 1: the columns, from a sample or from every record
+        schema = Schema()
+        if schema_mode == "full":
+            for columns, records, error in pool.map(scan_chunk, chunks):
+                if error:
+                    print(f"Invalid JSON format in {error}")
+                    return None
+                schema.merge(columns, records)
+        else:
+            try:
+                records = (record for chunk in chunks for record in iter_chunk_records(chunk)
+                           if isinstance(record, dict))
+                for record in islice(records, sample_size):
+                    schema.add(record)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"Invalid JSON format: {e}")
+                return None
+        fieldnames = schema.fieldnames
+
+        # Pass 2: every work item to its own part file, next to the output
+        part_dir = tempfile.mkdtemp(prefix=".json2csv-", dir=os.path.dirname(os.path.abspath(output_file)))
+        try:
+            part_files = [os.path.join(part_dir, f"{i:06d}.csv") for i in range(len(chunks))]
+            results = list(pool.map(convert_chunk, chunks, repeat(fieldnames), part_files))
+            errors = [error for *_, error in results if error]
+            if errors:
+                print(f"Invalid JSON format in {errors[0]}")
+                return None
+            written = sum(result[0] for result in results)
+            if not written:
+                print("No data to convert.")
+                return 0
+
+            # Header once, then the parts in order
+            tmp_file = output_file + ".tmp"
+            with open(tmp_file, "w", newline="", encoding="utf-8") as out:
+                csv.writer(out).writerow(fieldnames)
+                out.flush()
+                for part_file in part_files:
+                    with open(part_file, "rb") as part:
+                        shutil.copyfileobj(part, out.buffer, WRITE_BUFFER)
+            os.replace(tmp_file, output_file)
+        finally:
+            shutil.rmtree(part_dir, ignore_errors=True)
+
+    late_keys = {}
+    for _, _, chunk_late_keys, _ in results:
+        for key, count in chunk_late_keys.items():
+            late_keys[key] = late_keys.get(key, 0) + count
+    if show_schema:
+        print_schema(schema)
+    if schema_file:
+        save_schema(schema, schema_file)
+    print_summary(output_file, written, sum(result[1] for result in results), late_keys, sample_size)
+    return written
+
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, fmt="auto", schema_mode="sample",
+         sample_size=SAMPLE_SIZE, schema_file=None, show_schema=False, jobs=1):
     """Main entry point: orchestrates the JSON-to-CSV conversion."""
     print("Starting JSON to CSV conversion...")
-    
-    # Step 1: Load JSON data from the input file
-    data = load_json_data(INPUT_FILE)
-    
-    # Step 2: If data was loaded successfully, save it as CSV
-    if data:
-        save_csv_data(data, OUTPUT_FILE)
+
+    # A directory of dumps, or any input with several workers, goes through
+    # the process pool; a single file otherwise streams in this process
+    if jobs > 1 or os.path.isdir(input_file):
+        convert_parallel(input_file, output_file, fmt, schema_mode, sample_size, jobs,
+                         schema_file, show_schema)
     else:
-        print("No data to convert.")
+        # Records are streamed from the input straight into the CSV, so the
+        # input can be far larger than the available memory
+        stream_json_to_csv(input_file, output_file, fmt, schema_mode, sample_size, schema_file,
+                           show_schema)
 
 
 # Run the main function only when this script is executed directly
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Convert JSON (array or JSON Lines) to CSV")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE,
+                        help=f"JSON input file, or a directory of them (default: {INPUT_FILE})")
+    parser.add_argument("output", nargs="?", default=OUTPUT_FILE, help=f"CSV output (default: {OUTPUT_FILE})")
+    parser.add_argument("--format", choices=("auto", "array", "jsonl", "json"), default="auto",
+                        help="input layout (default: detect from extension and first line)")
+    parser.add_argument("--schema", choices=("sample", "full"), default="sample",
+                        help="take the columns from the first --sample records (default) or from "
+                             "all records, spilling them to a temporary file for the second pass")
+    parser.add_argument("--sample", type=int, default=SAMPLE_SIZE,
+                        help=f"records scanned in sample mode (default: {SAMPLE_SIZE})")
+    parser.add_argument("--schema-file", help="also write the inferred columns and types to this JSON file")
+    parser.add_argument("--show-schema", action="store_true", help="print the inferred columns and types")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes; JSON Lines inputs are split into byte ranges")
+    args = parser.parse_args()
+    main(args.input, args.output, args.format, args.schema, args.sample, args.schema_file,
+         args.show_schema, args.jobs)
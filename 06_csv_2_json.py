@@ -1,10 +1,32 @@
 import os
+import re
 import json
+import math
 import csv
+import mmap
+import codecs
+import argparse
+from itertools import chain, islice
 
 # Define the input CSV file and the output JSON file paths
 INPUT_FILE = "converted_data.csv"
 OUTPUT_FILE = "converted_data.json"
+# Rows inspected to decide each column's type when coercing values
+SAMPLE_ROWS = 1000
+# Bytes buffered before the JSON output is written to disk
+WRITE_BUFFER = 1024 * 1024
+# Output files with these extensions are written as JSON Lines
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+# Text recognised by the type coercion. Numbers with leading zeros (zip
+# codes, ids) are left as strings.
+INTEGER = re.compile(r"-?(?:0|[1-9][0-9]*)")
+FLOAT = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+BOOLEANS = {"true": True, "false": False}
+# Bytes of the output decoded first when previewing; the window grows until
+# the preview records fit
+PREVIEW_READ = 64 * 1024
+decoder = json.JSONDecoder()
+WHITESPACE = re.compile(r"[ \t\n\r]*")
 
 
 def load_csv_data(filename):
@@ -20,9 +42,7 @@ def load_csv_data(filename):
     # Open the CSV file and read its contents using DictReader
     with open(filename, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
-        data = list(reader)
-        print(data)  # Print the loaded data for debugging purposes
-        return data
+        return list(reader)
 
 
 def save_json_data(data, filename):
@@ -35,37 +55,303 @@ def save_json_data(data, filename):
         print(f"✅ Data saved to {filename}")
 
 
-def preview_json_data(filename, count=3):
+def infer_column_type(values):
     """
-    Load the JSON file and print the first 'count' entries for quick preview.
+    Return the type shared by every non-empty sampled value of a column:
+    "int", "float", "bool", "null" (all empty) or "str".
+    """
+    values = [value for value in values if value != ""]
+    if not values:
+        return "null"
+    if all(INTEGER.fullmatch(value) for value in values):
+        return "int"
+    if all(FLOAT.fullmatch(value) for value in values):
+        return "float"
+    if all(value.lower() in BOOLEANS for value in values):
+        return "bool"
+    return "str"
+
+
+def infer_types(header, sample):
+    """Infer the type of every column from a sample of rows."""
+    columns = [[] for _ in header]
+    for row in sample:
+        for values, value in zip(columns, row):
+            values.append(value)
+    return [infer_column_type(values) for values in columns]
+
+
+def parse_int(text):
+    return int(text) if INTEGER.fullmatch(text) else text
+
+
+def parse_float(text):
+    # Values too large for a float (1e999) would become Infinity, which
+    # isn't valid JSON
+    if FLOAT.fullmatch(text):
+        value = float(text)
+        if math.isfinite(value):
+            return value
+    return text
+
+
+def parse_bool(text):
+    return BOOLEANS.get(text.lower(), text)
+
+
+def make_converter(column_type):
+    """
+    Return a function turning a CSV value into the JSON value of
+    'column_type'. Empty values become null; values that don't fit the type
+    (seen after the sample) are kept as text, using the same patterns as the
+    type inference.
+    """
+    parse = {"int": parse_int, "float": parse_float, "bool": parse_bool,
+             "null": str, "str": str}[column_type]
+
+    def convert(text):
+        return None if text == "" else parse(text)
+
+    return convert
+
+
+def iter_json_records(reader, header, types=None):
+    """
+    Yield every row of 'reader' as a dict keyed by 'header', like
+    csv.DictReader. With 'types' every column is converted to its type, and
+    empty values become null in every column, text ones included.
+    """
+    width = len(header)
+    converters = []
+    if types:
+        converters = [(i, make_converter(column_type))
+                      for i, column_type in enumerate(types)]
+    for row in reader:
+        if not row:
+            continue  # DictReader skips blank lines too
+        for i, convert in converters:
+            if i < len(row):
+                row[i] = convert(row[i])
+        record = dict(zip(header, row))
+        if len(row) != width:
+            # Same as DictReader: missing fields are null, extra ones go under a null key
+            for key in header[len(row):]:
+                record[key] = None
+            if len(row) > width:
+                record[None] = row[width:]
+        yield record
+
+
+def write_json_stream(records, f, fmt="array", compact=False):
+    """
+    Write records to an open file one at a time, as a JSON array (indented
+    like json.dump(data, f, indent=2) unless 'compact') or as JSON Lines.
+    Returns the number of records written.
+    """
+    count = 0
+    if fmt == "jsonl":
+        encode = json.JSONEncoder(separators=(",", ":") if compact else None, allow_nan=False).encode
+        for record in records:
+            f.write(encode(record))
+            f.write("\n")
+            count += 1
+        return count
+
+    if compact:
+        encode = json.JSONEncoder(separators=(",", ":"), allow_nan=False).encode
+        separator, opening, closing = ",", "[", "]"
+    else:
+        encoder = json.JSONEncoder(indent=2, allow_nan=False).encode
+
+        def encode(record):
+            # Nest the record one level into the array; JSON strings never
+            # contain raw newlines, so every newline starts a new line
+            return "  " + encoder(record).replace("\n", "\n  ")
+        separator, opening, closing = ",\n", "[\n", "\n]"
+
+    for record in records:
+        f.write(separator if count else opening)
+        f.write(encode(record))
+        count += 1
+    f.write(closing if count else "[]")
+    return count
+
+
+def output_format(filename, fmt=None):
+    """Return 'fmt', or the layout implied by the file's extension."""
+    return fmt or ("jsonl" if filename.lower().endswith(JSON_LINES_EXTENSIONS) else "array")
+
+
+def convert_csv_to_json(input_file, output_file, fmt=None, compact=False, coerce=False,
+                        sample_rows=SAMPLE_ROWS):
+    """
+    Stream a CSV file into a JSON array or JSON Lines file ('fmt', by
+    default taken from the output extension) one row at a time.
+
+    With 'coerce' the column types (int, float, bool, null) are inferred
+    from the first 'sample_rows' rows and values are converted accordingly;
+    otherwise every value stays a string, as with csv.DictReader. The output
+    is written to a temporary file that replaces 'output_file' when done.
+    Returns the number of records written, or None if there was no input.
+    """
+    if not os.path.exists(input_file):
+        print(f"Error: {input_file} does not exist.")
+        return None
+    fmt = output_format(output_file, fmt)
+
+    tmp_file = output_file + ".tmp"
+    try:
+        with open(input_file, "r", newline="", encoding="utf-8") as src:
+            reader = csv.reader(src)
+            header = next(reader, None)
+            if header is None:
+                print("No data to save.")
+                return None
+            types = None
+            rows = reader
+            if coerce:
+                sample = list(islice(reader, sample_rows))
+                types = infer_types(header, sample)
+                rows = chain(sample, reader)
+            with open(tmp_file, "w", encoding="utf-8", buffering=WRITE_BUFFER) as out:
+                count = write_json_stream(iter_json_records(rows, header, types), out, fmt, compact)
+    except (csv.Error, UnicodeDecodeError) as e:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        print(f"Invalid CSV format: {e}")
+        return None
+    except BaseException:
+        # Any other failure (or Ctrl+C) still leaves no half-written file behind
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, output_file)
+
+    if types:
+        print("Column types: " + ", ".join(f"{name}={column_type}"
+                                           for name, column_type in zip(header, types)))
+    print(f"✅ {count} records saved to {output_file}")
+    return count
+
+
+def decode_array_head(text, count, complete):
+    """
+    Decode the first 'count' elements of the JSON array at the start of
+    'text'. Returns None when 'text' is only the beginning of the file (not
+    'complete') and ends before those elements do. Raises ValueError if the
+    text isn't a JSON array.
+    """
+    records = []
+    pos = WHITESPACE.match(text).end()
+    if pos == len(text) and not complete:
+        return None
+    if not text.startswith("[", pos):
+        raise ValueError("not a JSON array")
+    pos += 1
+    while len(records) < count:
+        pos = WHITESPACE.match(text, pos).end()
+        if pos == len(text):
+            if complete:
+                raise ValueError("unterminated JSON array")
+            return None
+        if text[pos] == "]":
+            break
+        if records:
+            if text[pos] != ",":
+                raise ValueError(f"expected ',' at character {pos}")
+            pos = WHITESPACE.match(text, pos + 1).end()
+        try:
+            record, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            if complete:
+                raise
+            return None
+        if pos == len(text) and not complete:
+            return None  # a number may go on past the window
+        records.append(record)
+    return records
+
+
+def read_json_head(filename, count=3, fmt=None):
+    """
+    Return the first 'count' records of a JSON array or JSON Lines file
+    ('fmt', by default taken from the extension) without reading the rest.
+    The file is memory-mapped and only the bytes up to those records are
+    decoded, so the cost doesn't depend on the file size.
+    """
+    fmt = output_format(filename, fmt)
+    if count <= 0 or os.path.getsize(filename) == 0:
+        if fmt == "array":
+            raise ValueError("not a JSON array")
+        return []
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if fmt == "jsonl":
+            records = []
+            pos = 0
+            while len(records) < count and pos < len(mm):
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    end = len(mm)
+                line = mm[pos:end]
+                if line.strip():
+                    records.append(json.loads(line))
+                pos = end + 1
+            return records
+
+        # Decode a growing window from the start of the file; the incremental
+        # decoder holds back a UTF-8 sequence cut by the window's end
+        window = PREVIEW_READ
+        while True:
+            complete = window >= len(mm)
+            text = codecs.getincrementaldecoder("utf-8")().decode(mm[:window], final=complete)
+            records = decode_array_head(text, count, complete)
+            if records is not None:
+                return records
+            window *= 4
+
+
+def preview_json_data(filename, count=3, fmt=None):
+    """
+    Print the first 'count' entries of the JSON file for quick preview.
+    Only those entries are decoded, so large files preview instantly.
     Default preview count is 3 entries.
     """
-    # Open the JSON file and load its contents
-    with open(filename, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        # Print the first 'count' entries with indentation for readability
-        print(json.dumps(data[:count], indent=2))
+    try:
+        records = read_json_head(filename, count, fmt)
+    except ValueError as e:
+        print(f"Error: can't preview {filename}: {e}")
+        return
+    # Print the first 'count' entries with indentation for readability
+    print(json.dumps(records, indent=2))
 
 
-def main():
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, fmt=None, compact=False, coerce=False,
+         sample_rows=SAMPLE_ROWS):
     """
     Main function to orchestrate the CSV to JSON conversion process:
-    1. Load data from the CSV file.
-    2. Save the data to a JSON file.
-    3. Preview the first few entries of the JSON file.
-    """
-    # Load data from the input CSV file
-    data = load_csv_data(INPUT_FILE)
-    # If no data is loaded, exit early
-    if not data:
-        print("No data to save.")
+    1. Stream the rows of the CSV file into the JSON file.
+    2. Preview the first few entries of the JSON file.
+    """
+    # Convert row by row, so memory use doesn't grow with the file
+    count = convert_csv_to_json(input_file, output_file, fmt, compact, coerce, sample_rows)
+    # If nothing was written, exit early (convert_csv_to_json already said why)
+    if not count:
         return
-    # Save the loaded data to the output JSON file
-    save_json_data(data, OUTPUT_FILE)
     # Preview the first few entries of the saved JSON file
-    preview_json_data(OUTPUT_FILE)
+    preview_json_data(output_file, fmt=fmt)
 
 
 # Entry point of the script: run the main function when the script is executed directly
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Convert CSV to a JSON array or JSON Lines")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE, help=f"CSV input (default: {INPUT_FILE})")
+    parser.add_argument("output", nargs="?", default=OUTPUT_FILE, help=f"JSON output (default: {OUTPUT_FILE})")
+    parser.add_argument("--format", choices=("array", "jsonl"),
+                        help="output layout (default: jsonl for .jsonl/.ndjson outputs, else array)")
+    parser.add_argument("--compact", action="store_true", help="no indentation or spaces in the output")
+    parser.add_argument("--types", action="store_true",
+                        help="convert int/float/bool/empty values, with column types inferred from a sample")
+    parser.add_argument("--sample", type=int, default=SAMPLE_ROWS,
+                        help=f"rows sampled to infer the column types (default: {SAMPLE_ROWS})")
+    args = parser.parse_args()
+    main(args.input, args.output, args.format, args.compact, args.types, args.sample)
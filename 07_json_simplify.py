@@ -1,75 +1,163 @@
 import os
+import csv
 import json
+import argparse
+import importlib.util
 
 # Input and output file names
 INPUT_FILE = "nested_data.json"
 OUTPUT_FILE = "simplified_data.json"
+# Default output of --records: one flat record per line
+RECORDS_OUTPUT_FILE = "simplified_data.jsonl"
+# Bytes buffered before the flattened records are written to disk
+WRITE_BUFFER = 1024 * 1024
 
 
-def flatten_json(data, parent_key="", sep="_"):
+def flatten_json(data, parent_key="", sep="_", tuple_keys=False):
     """
-    Recursively flattens a nested JSON structure into a single-level dictionary.
-    
+    Flattens a nested JSON structure into a single-level dictionary.
+
+    The structure is walked depth-first with an explicit stack of
+    iterators, so there is no recursion limit on deeply nested input, and
+    every value is written straight into one output dictionary. Empty
+    objects and arrays leave no key, as before.
+
     Args:
         data: The JSON data (dict, list, or primitive value).
-        parent_key: The accumulated key string from parent levels.
+        parent_key: The key prefix for the top level (a tuple with tuple_keys).
         sep: The separator used to join nested keys.
-    
+        tuple_keys: Use key-path tuples such as ("user", 0, "name") instead
+            of joined strings; 'sep' is then unused.
+
     Returns:
         A dictionary with flattened keys and corresponding values.
     """
-    items = {}
+    if tuple_keys and parent_key == "":
+        parent_key = ()
+    if not isinstance(data, (dict, list)):
+        return {parent_key: data}
 
-    # If data is a dictionary, iterate through its key-value pairs
-    if isinstance(data, dict):
-        for k, v in data.items():
+    items = {}
+    # Each entry is a key prefix and the iterator over that level's children
+    stack = [(parent_key, iter(data.items()) if isinstance(data, dict) else enumerate(data))]
+    while stack:
+        prefix, children = stack[-1]
+        for k, v in children:
             # Build the full key by appending the current key to the parent key
-            full_key = f"{parent_key}{sep}{k}" if parent_key else k
-            print(full_key)  # Debug: print the current key being processed
-            # Recursively flatten the value and update items
-            items.update(flatten_json(v, full_key, sep=sep))
-    
-    # If data is a list, iterate through its elements with index
-    elif isinstance(data, list):
-        for idx, item in enumerate(data):
-            # Build the full key using the index as part of the key
-            full_key = f"{parent_key}{sep}{idx}" if parent_key else str(idx)
-            print(full_key)  # Debug: print the current key being processed
-            # Recursively flatten each item and update items
-            items.update(flatten_json(item, full_key, sep=sep))
-    
-    # If data is a primitive (string, number, etc.), add it to items
-    else:
-        items[parent_key] = data
+            if tuple_keys:
+                full_key = prefix + (k,)
+            else:
+                full_key = f"{prefix}{sep}{k}" if prefix else str(k)
+            if isinstance(v, dict):
+                # Descend; this level resumes where it stopped once the child is done
+                stack.append((full_key, iter(v.items())))
+                break
+            if isinstance(v, list):
+                stack.append((full_key, enumerate(v)))
+                break
+            items[full_key] = v
+        else:
+            stack.pop()
 
     return items
 
 
-def main():
+# 05_json_2_csv.py, whose streaming record reader is reused here; loaded on first use
+_json_converter = None
+
+
+def json_converter():
+    """
+    Return the JSON to CSV converter script as a module. Its name starts
+    with a digit, so it is loaded by path rather than imported. (Kept
+    identical in 01_grade_insight.py.)
+    """
+    global _json_converter
+    if _json_converter is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "05_json_2_csv.py")
+        spec = importlib.util.spec_from_file_location("json_2_csv", path)
+        _json_converter = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_json_converter)
+    return _json_converter
+
+
+def flatten_records(filename, sep="_"):
+    """
+    Yield every record of 'filename' flattened on its own. Records are read
+    with the JSON to CSV converter's streaming reader: the elements of a
+    top-level array, the lines of a JSON Lines file, or a single document.
+    """
+    for record in json_converter().iter_records(filename):
+        yield flatten_json(record, sep=sep)
+
+
+def flatten_file_records(input_file, output_file, sep="_", fmt=None):
+    """
+    Stream the records of 'input_file' into 'output_file' with every record
+    flattened independently, as JSON Lines (ready for the JSON to CSV
+    converter) or, with fmt "csv" or a .csv output, as CSV rows.
+
+    The CSV header is the union of all flattened keys, so the input is read
+    twice: once for the keys, once for the rows. Either way only one record
+    is held in memory. Returns the number of records written.
+    """
+    fmt = fmt or ("csv" if output_file.lower().endswith(".csv") else "jsonl")
+    count = 0
+    if fmt == "csv":
+        fieldnames = {}
+        for record in flatten_records(input_file, sep):
+            fieldnames.update(dict.fromkeys(record))
+        with open(output_file, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for record in flatten_records(input_file, sep):
+                writer.writerow(map(record.get, fieldnames))
+                count += 1
+    else:
+        encode = json.JSONEncoder().encode
+        with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            for record in flatten_records(input_file, sep):
+                f.write(encode(record))
+                f.write("\n")
+                count += 1
+    return count
+
+
+def main(input_file=INPUT_FILE, output_file=None, sep=None, records=False, fmt=None):
     """
-    Main function to load JSON, flatten it, and save the result.
+    Main function to load JSON, flatten it, and save the result. With
+    'records' every record of the input is flattened on its own and
+    streamed to the output instead.
     """
     # Check if the input file exists
-    if not os.path.exists(INPUT_FILE):
-        print(f"Error: {INPUT_FILE} does not exist.")
+    if not os.path.exists(input_file):
+        print(f"Error: {input_file} does not exist.")
         return
 
     try:
+        # Prompt user for a custom separator, default to underscore
+        if sep is None:
+            sep = input("Enter separator (default: '_'): ") or "_"
+
+        if records:
+            output_file = output_file or RECORDS_OUTPUT_FILE
+            count = flatten_file_records(input_file, output_file, sep, fmt)
+            print(f"✅ {count} flattened records saved to {output_file}")
+            return
+
         # Load the JSON data from the input file
-        with open(INPUT_FILE, "r", encoding="utf-8") as f:
+        with open(input_file, "r", encoding="utf-8") as f:
             data = json.load(f)
-        
-        # Prompt user for a custom separator, default to underscore
-        sep = input("Enter separator (default: '_'): ") or "_"
-        
+
         # Flatten the JSON data
         flattened_data = flatten_json(data, sep=sep)
 
         # Save the flattened data to the output file
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        output_file = output_file or OUTPUT_FILE
+        with open(output_file, "w", encoding="utf-8") as f:
             json.dump(flattened_data, f, indent=2)
-            print(f"✅ Data saved to {OUTPUT_FILE}")
-    
+            print(f"✅ Data saved to {output_file}")
+
     # Catch and print any exceptions that occur
     except Exception as e:
         print(f"Error: {e}")
@@ -78,4 +166,14 @@ def main():
 
 # Entry point of the script
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Flatten nested JSON")
+    parser.add_argument("input", nargs="?", default=INPUT_FILE, help=f"JSON input (default: {INPUT_FILE})")
+    parser.add_argument("output", nargs="?",
+                        help=f"output file (default: {OUTPUT_FILE}, or {RECORDS_OUTPUT_FILE} with --records)")
+    parser.add_argument("--sep", help="separator joining nested keys (asked for if omitted)")
+    parser.add_argument("--records", action="store_true",
+                        help="flatten each array element or JSON Lines line into its own flat record")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="--records output layout (default: csv for .csv outputs, else jsonl)")
+    args = parser.parse_args()
+    main(args.input, args.output, args.sep, args.records, args.format)